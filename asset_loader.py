@@ -0,0 +1,70 @@
+import os, time
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AssetLoader:
+    # Decodifica imágenes y sonidos en un pool de hilos.
+    # convert()/convert_alpha() necesitan la pantalla: se hacen en el hilo principal al pedir el asset.
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.raw = {}
+        self.images = {}
+        self.sounds = {}
+
+    def prefetch(self, *paths):
+        for p in paths:
+            if p not in self.raw:
+                self.raw[p] = self.pool.submit(pygame.image.load, p)
+
+    def prefetch_sound(self, *paths):
+        for p in paths:
+            if p not in self.sounds:
+                self.sounds[p] = self.pool.submit(pygame.mixer.Sound, p)
+
+    def image(self, path, alpha=True):
+        key = (path, alpha)
+        img = self.images.get(key)
+        if img is None:
+            self.prefetch(path)
+            raw = self.raw[path].result()
+            # Con el backend sdl2 no hay superficie de pantalla: la textura se crea del original
+            if pygame.display.get_surface() is None:
+                img = raw
+            else:
+                img = raw.convert_alpha() if alpha else raw.convert()
+            self.images[key] = img
+        return img
+
+    def forget(self, path):
+        # Para recargar un archivo que ha cambiado en disco
+        self.raw.pop(path, None)
+        for alpha in (True, False):
+            self.images.pop((path, alpha), None)
+
+    def sound(self, path):
+        self.prefetch_sound(path)
+        return self.sounds[path].result()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class StartupTimer:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, (time.perf_counter() - self.t0) * 1000))
+
+    def report(self):
+        if not os.environ.get("TEMPLO_STARTUP_REPORT"): return
+        prev = 0.0
+        print("Arranque:")
+        for name, ms in self.marks:
+            print(f"  {name:<14} {ms:8.1f} ms  (+{ms - prev:.1f})")
+            prev = ms
+
+
+loader = AssetLoader()
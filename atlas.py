@@ -0,0 +1,159 @@
+import os, sys, json
+import pygame
+from asset_loader import loader
+
+ASSETS  = "assets"
+PLAYER  = os.path.join(ASSETS, "player")
+PLAYERS = os.path.join(ASSETS, "players")
+MENU    = os.path.join(ASSETS, "menu")
+ATLAS   = os.path.join(ASSETS, "atlas")
+ATLAS_META = os.path.join(ATLAS, "atlas.json")
+
+PAGE_W, PAGE_H = 1024, 2048
+PAD = 2
+
+
+# ---------- Construcción (offline) ----------
+
+def _split_strip(img, fw, fh):
+    return [img.subsurface((x, 0, fw, fh)) for x in range(0, img.get_width() - fw + 1, fw)]
+
+
+def collect_sources():
+    # nombre de animación -> lista de (nombre de frame, Surface)
+    anims = {}
+
+    meta = json.load(open(os.path.join(PLAYER, "player_meta.json")))
+    for anim, files in meta["animations"].items():
+        anims["player/" + anim] = [
+            (f"player/{os.path.splitext(f)[0]}", pygame.image.load(os.path.join(PLAYER, f)))
+            for f in files
+        ]
+
+    # Tiras de assets/players: frames cuadrados del alto de la tira
+    for f in sorted(os.listdir(PLAYERS)):
+        if not f.endswith(".png"): continue
+        name = os.path.splitext(f)[0]
+        img = pygame.image.load(os.path.join(PLAYERS, f))
+        fh = img.get_height()
+        anims["players/" + name] = [
+            (f"players/{name}_{i:02}", fr) for i, fr in enumerate(_split_strip(img, fh, fh), 1)
+        ]
+
+    anims["menu/torch"] = [
+        (f"menu/torch_{i:02}", pygame.image.load(os.path.join(MENU, f"torch_{i:02}.png")))
+        for i in range(1, 5)
+    ]
+    for name in ("btn_stone", "btn_stone_hover"):
+        anims["menu/" + name] = [("menu/" + name, pygame.image.load(os.path.join(MENU, name + ".png")))]
+    return anims, meta["frame_size"]
+
+
+def sheet_of(anim):
+    # Las tiras grandes de assets/players van en hojas aparte para no retrasar el menú
+    return "players" if anim.startswith("players/") else "ui"
+
+
+def pack(sizes, page_w=PAGE_W, page_h=PAGE_H, pad=PAD):
+    # Empaquetado por estantes, de más alto a más bajo. Devuelve {i: (page, x, y)}.
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placed = {}
+    page, x, y, shelf_h = 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i]
+        if w + pad > page_w or h + pad > page_h:
+            raise ValueError(f"Sprite {w}x{h} no cabe en una página {page_w}x{page_h}")
+        if x + w + pad > page_w:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h + pad > page_h:
+            page, x, y, shelf_h = page + 1, 0, 0, 0
+        placed[i] = (page, x, y)
+        x += w + pad
+        shelf_h = max(shelf_h, h + pad)
+    return placed
+
+
+def build_atlas(out_dir=ATLAS):
+    anims, frame_size = collect_sources()
+    frames = [(anim, name, surf) for anim, lst in anims.items() for name, surf in lst]
+
+    placed = {}
+    n_pages = 0
+    for sheet in ("ui", "players"):
+        idx = [i for i, (anim, _, _) in enumerate(frames) if sheet_of(anim) == sheet]
+        if not idx: continue
+        sub = pack([frames[i][2].get_size() for i in idx])
+        for j, (p, x, y) in sub.items():
+            placed[idx[j]] = (n_pages + p, x, y)
+        n_pages += max(p for p, _, _ in sub.values()) + 1
+    used = [[0, 0] for _ in range(n_pages)]
+    for i, (p, x, y) in placed.items():
+        w, h = frames[i][2].get_size()
+        used[p][0] = max(used[p][0], x + w)
+        used[p][1] = max(used[p][1], y + h)
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in used]
+
+    meta = {
+        "frame_size": frame_size,
+        "spritesheets": [f"atlas_{p}.png" for p in range(n_pages)],
+        "animations": {},
+        "rects": {},
+    }
+    for i, (anim, name, surf) in enumerate(frames):
+        p, x, y = placed[i]
+        pages[p].blit(surf, (x, y))
+        w, h = surf.get_size()
+        meta["animations"].setdefault(anim, []).append(name)
+        meta["rects"].setdefault(anim, []).append({"x": x, "y": y, "w": w, "h": h, "page": p})
+
+    os.makedirs(out_dir, exist_ok=True)
+    for p, page in enumerate(pages):
+        pygame.image.save(page, os.path.join(out_dir, meta["spritesheets"][p]))
+    with open(os.path.join(out_dir, "atlas.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+# ---------- Carga en tiempo de ejecución ----------
+
+class Atlas:
+    def __init__(self, meta_path=ATLAS_META):
+        base = os.path.dirname(meta_path)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        # Cada hoja se decodifica la primera vez que se pide uno de sus frames
+        self.paths = [os.path.join(base, p) for p in meta["spritesheets"]]
+        self.frame_size = tuple(meta["frame_size"])
+        self.rects = meta["rects"]
+        self._cache = {}
+
+    def __contains__(self, anim):
+        return anim in self.rects
+
+    def frames(self, anim):
+        fr = self._cache.get(anim)
+        if fr is None:
+            fr = [
+                loader.image(self.paths[r["page"]]).subsurface((r["x"], r["y"], r["w"], r["h"]))
+                for r in self.rects[anim]
+            ]
+            self._cache[anim] = fr
+        return fr
+
+    def frame(self, anim, i=0):
+        return self.frames(anim)[i]
+
+
+_atlas = None
+
+def get_atlas():
+    global _atlas
+    if _atlas is None:
+        _atlas = Atlas()
+    return _atlas
+
+
+if __name__ == "__main__":
+    meta = build_atlas(sys.argv[1] if len(sys.argv) > 1 else ATLAS)
+    n = sum(len(v) for v in meta["rects"].values())
+    print(f"Atlas: {n} frames en {len(meta['spritesheets'])} página(s)")
@@ -0,0 +1,237 @@
+import os, sys, json, time, random, tempfile, argparse
+
+# Sin ventana ni audio: se puede lanzar en CI o por SSH
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main
+from main import (Level, Player, Enemy, ChaserEnemy, CombatSystem, TrapDamage, SawDamage,
+                  EnemyCollisionDamage, find_safe_spawn, TILES, MAPS, TILE)
+from menu_screen import MenuScreen
+from asset_loader import loader
+from tilemap import load_csv, slice_tiles
+
+ASSETS = "assets"
+BASELINE = os.path.join(ASSETS, "cache", "bench_baseline.json")
+THRESHOLD = 0.25      # más de un 25% por encima de la línea base = regresión
+
+CRYPT_CSV = os.path.join(MAPS, "level3_crypt.csv")
+CRYPT_TILES = os.path.join(TILES, "crypt_tiles.png")
+
+MAP_ROWS = (64, 256, 1024)      # mapas generados: cómo crece cada primitiva con el nivel
+ENEMY_COUNTS = (10, 100, 500)
+
+
+# ---------- Mapas generados ----------
+
+def generate_map(rows, cols=24, seed=1):
+    # Paredes, suelo y plataformas cada 3 filas con trampas, enemigos, sierras y escaleras.
+    # Las columnas 1-2 quedan libres de arriba abajo: sirven para medir caídas largas.
+    rnd = random.Random(seed)
+    grid = [[0]*cols for _ in range(rows)]
+    for y in range(rows):
+        grid[y][0] = grid[y][cols-1] = 4
+    grid[0] = [4]*cols
+    grid[rows-1] = [4] + [1]*(cols-2) + [4]
+    for y in range(4, rows-2, 3):
+        x = rnd.randint(4, cols-10)
+        n = rnd.randint(4, 8)
+        for cx in range(x, x+n): grid[y][cx] = 3
+        grid[y-1][x+1] = rnd.choice((8, 8, 12, 5, 13, 0))
+        if rnd.random() < 0.3: grid[y-1][x+n-1] = 19
+        if rnd.random() < 0.2: grid[y][x+n] = 11
+        if rnd.random() < 0.3: grid[y+1][x] = 10
+    return grid
+
+
+def write_map(grid, folder):
+    path = os.path.join(folder, f"gen_{len(grid)}.csv")
+    with open(path, "w") as f:
+        f.write("\n".join(",".join(map(str, row)) for row in grid))
+    return path
+
+
+# ---------- Casos ----------
+# Cada caso prepara su estado y devuelve la función a medir
+
+def case_load_csv(path):
+    return lambda: load_csv(path)
+
+
+def case_slice_tiles():
+    img = loader.image(CRYPT_TILES)
+    return lambda: slice_tiles(img)
+
+
+def case_level_init(path):
+    return lambda: Level(CRYPT_TILES, path)
+
+
+def case_level_draw(path, where, cold=False):
+    lv = Level(CRYPT_TILES, path)
+    surf = pygame.Surface((main.W, main.H))
+    camy = {"arriba": 0, "medio": (lv.h*TILE - main.H)//2, "abajo": lv.h*TILE - main.H}[where]
+    lv.draw(surf, 0, camy)
+    def run():
+        if cold: lv.chunks.clear()
+        lv.draw(surf, 0, camy)
+    return run
+
+
+def case_player_fall(path):
+    # Caída por el hueco libre hasta el suelo en un solo paso (el peor caso de step)
+    lv = Level(CRYPT_TILES, path)
+    p = Player(TILE+4, TILE)
+    dy = lv.h*TILE
+    def run():
+        p.rect.topleft = (TILE+4, TILE)
+        p.step(0, dy, lv.solids_near(p.rect.inflate(0, dy*2)))
+    return run
+
+
+def case_find_safe_spawn(path):
+    # Punto dentro del suelo: tiene que sondear hacia arriba y luego bajar
+    lv = Level(CRYPT_TILES, path)
+    y = (lv.h-1)*TILE
+    return lambda: find_safe_spawn(lv, 64, y, 32, 48)
+
+
+def _spawns(lv, n):
+    pts = lv.enemy_spawns + lv.chaser_spawns or [(2*TILE, (lv.h-2)*TILE)]
+    return [pts[i % len(pts)] for i in range(n)]
+
+
+def case_enemy_update(path, n, chaser=False):
+    lv = Level(CRYPT_TILES, path)
+    p = Player(*find_safe_spawn(lv, 64, (lv.h-3)*TILE, 32, 48))
+    enemies = [ChaserEnemy(x, y, p) if chaser else Enemy(x, y) for x, y in _spawns(lv, n)]
+    for e in enemies: e.update(1/60, lv)
+    def run():
+        for e in enemies: e.update(1/60, lv)
+    return run
+
+
+def case_combat(path, n):
+    lv = Level(CRYPT_TILES, path)
+    p = Player(TILE+4, TILE)
+    enemies = pygame.sprite.Group([Enemy(x, y) for x, y in _spawns(lv, n)])
+    combat = CombatSystem()
+    combat.add(TrapDamage(lv))
+    combat.add(SawDamage(lv))
+    combat.add(EnemyCollisionDamage(enemies))
+    return lambda: combat.apply_all(p, 0)
+
+
+def case_menu_draw():
+    noop = lambda: None
+    menu = MenuScreen(noop, noop, noop, noop)
+    surf = pygame.Surface((main.W, main.H))
+    menu.draw(surf)
+    def run():
+        menu.update(1/60)
+        menu.draw(surf)
+    return run
+
+
+def cases(folder):
+    out = [
+        ("load_csv cripta", lambda: case_load_csv(CRYPT_CSV)),
+        ("slice_tiles", case_slice_tiles),
+        ("Level.__init__ cripta", lambda: case_level_init(CRYPT_CSV)),
+        ("MenuScreen.draw", case_menu_draw),
+    ]
+    for where in ("arriba", "medio", "abajo"):
+        out.append((f"Level.draw cripta {where}", lambda w=where: case_level_draw(CRYPT_CSV, w)))
+    out.append(("Level.draw cripta (sin caché)", lambda: case_level_draw(CRYPT_CSV, "medio", cold=True)))
+
+    # Misma primitiva seguida para los distintos tamaños de mapa
+    maps = {rows: write_map(generate_map(rows), folder) for rows in MAP_ROWS}
+    scaled = [
+        ("load_csv", case_load_csv),
+        ("Level.__init__", case_level_init),
+        ("Level.draw abajo", lambda p: case_level_draw(p, "abajo")),
+        ("Player.step caída", case_player_fall),
+        ("find_safe_spawn", case_find_safe_spawn),
+        ("CombatSystem.apply_all", lambda p: case_combat(p, 50)),
+    ]
+    for label, make in scaled:
+        for rows, path in maps.items():
+            out.append((f"{label} [{rows} filas]", lambda m=make, p=path: m(p)))
+    mid = maps[MAP_ROWS[1]]
+    for n in ENEMY_COUNTS:
+        out.append((f"Enemy.update x{n}", lambda k=n: case_enemy_update(mid, k)))
+        out.append((f"ChaserEnemy.update x{n}", lambda k=n: case_enemy_update(mid, k, chaser=True)))
+    return out
+
+
+# ---------- Medición ----------
+
+def measure(fn, min_time=0.2, repeat=5):
+    # Como timeit: se ajusta el número de llamadas por tanda y se queda la mejor tanda (ms por llamada)
+    number = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(number): fn()
+        elapsed = time.perf_counter() - t
+        if elapsed >= min_time/repeat or number >= 1 << 20: break
+        number *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        t = time.perf_counter()
+        for _ in range(number): fn()
+        best = min(best, time.perf_counter() - t)
+    return best*1000/number
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, results):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def run(pattern="", baseline=BASELINE, threshold=THRESHOLD, save=False, min_time=0.2):
+    main.init_display()
+    old = load_baseline(baseline)
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as folder:
+        for name, factory in cases(folder):
+            if pattern and pattern.lower() not in name.lower(): continue
+            ms = results[name] = measure(factory(), min_time)
+            ref = old.get(name)
+            if ref:
+                change = ms/ref - 1
+                flag = "  REGRESIÓN" if change > threshold else ""
+                if flag: regressions.append(name)
+                print(f"{name:<40} {ms:10.4f} ms   base {ref:10.4f} ms  {change:+7.1%}{flag}")
+            else:
+                print(f"{name:<40} {ms:10.4f} ms")
+    loader.shutdown()
+
+    if save:
+        save_baseline(baseline, {**old, **results})
+        print(f"Línea base guardada en {baseline}")
+    if regressions:
+        print(f"{len(regressions)} regresión(es) por encima del {threshold:.0%}")
+    return results, regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Microbenchmarks del motor (headless)")
+    ap.add_argument("-k", dest="pattern", default="", help="solo los casos que contengan este texto")
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    ap.add_argument("--save", action="store_true", help="guardar los resultados como nueva línea base")
+    ap.add_argument("--min-time", type=float, default=0.2, help="segundos por caso")
+    args = ap.parse_args()
+    _, regressions = run(args.pattern, args.baseline, args.threshold, args.save, args.min_time)
+    sys.exit(1 if regressions else 0)
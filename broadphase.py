@@ -0,0 +1,105 @@
+from tilemap import TILE
+
+
+class SpatialHash:
+    # Rejilla uniforme: cada objeto ocupa las celdas que toca su rect.
+    # Mover un objeto solo toca el diccionario cuando cambia de celdas.
+    def __init__(self, cell=TILE*2):
+        self.cell = cell
+        self.cells = {}
+        self.spans = {}
+
+    def _span(self, rect):
+        c = self.cell
+        return (rect.left//c, rect.top//c, (rect.right-1)//c, (rect.bottom-1)//c)
+
+    def _keys(self, span):
+        x0, y0, x1, y1 = span
+        return [(cx, cy) for cy in range(y0, y1+1) for cx in range(x0, x1+1)]
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, obj):
+        return obj in self.spans
+
+    def insert(self, obj):
+        span = self._span(obj.rect)
+        self.spans[obj] = span
+        for k in self._keys(span):
+            self.cells.setdefault(k, set()).add(obj)
+
+    def remove(self, obj):
+        span = self.spans.pop(obj, None)
+        if span is None: return
+        for k in self._keys(span):
+            bucket = self.cells.get(k)
+            if bucket is None: continue
+            bucket.discard(obj)
+            if not bucket: del self.cells[k]
+
+    def move(self, obj):
+        old = self.spans.get(obj)
+        new = self._span(obj.rect)
+        if old == new: return
+        if old is not None:
+            old_keys = set(self._keys(old))
+        else:
+            old_keys = set()
+        new_keys = set(self._keys(new))
+        for k in old_keys - new_keys:
+            bucket = self.cells.get(k)
+            if bucket is None: continue
+            bucket.discard(obj)
+            if not bucket: del self.cells[k]
+        for k in new_keys - old_keys:
+            self.cells.setdefault(k, set()).add(obj)
+        self.spans[obj] = new
+
+    def query(self, rect):
+        found = set()
+        for k in self._keys(self._span(rect)):
+            bucket = self.cells.get(k)
+            if bucket: found |= bucket
+        return found
+
+
+class StaticGrid:
+    # Los sólidos del mapa no se mueven: se reparten por celdas una vez
+    # (add/remove solo se usan al recargar el mapa en caliente).
+    def __init__(self, rects, cell=TILE*2):
+        self.cell = cell
+        self.cells = {}
+        for r in rects:
+            self.add(r)
+
+    def _cells_of(self, r):
+        c = self.cell
+        return [(cx, cy) for cy in range(r.top//c, (r.bottom-1)//c + 1)
+                for cx in range(r.left//c, (r.right-1)//c + 1)]
+
+    def add(self, rect):
+        for k in self._cells_of(rect):
+            self.cells.setdefault(k, []).append(rect)
+
+    def remove(self, rect):
+        for k in self._cells_of(rect):
+            bucket = self.cells.get(k)
+            if bucket and rect in bucket:
+                bucket.remove(rect)
+                if not bucket: del self.cells[k]
+
+    def query(self, rect):
+        c = self.cell
+        x0, y0 = rect.left//c, rect.top//c
+        x1, y1 = (rect.right-1)//c, (rect.bottom-1)//c
+        if x0 == x1 and y0 == y1:
+            return self.cells.get((x0, y0), [])
+        found = []
+        seen = set()
+        for cy in range(y0, y1+1):
+            for cx in range(x0, x1+1):
+                for r in self.cells.get((cx, cy), ()):
+                    if id(r) not in seen:
+                        seen.add(id(r)); found.append(r)
+        return found
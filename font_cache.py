@@ -0,0 +1,35 @@
+from collections import OrderedDict
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+_texts = OrderedDict()
+
+
+def get_font(family, size, bold=False):
+    # SysFont recorre las fuentes del sistema: se resuelve una sola vez por (familia, tamaño, negrita)
+    key = (family, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+    return font
+
+
+def render_text(text, color, family="arial", size=16, bold=False, antialias=True):
+    # Superficies de texto ya renderizadas, con límite LRU
+    key = (family, size, bold, text, tuple(color), antialias)
+    surf = _texts.get(key)
+    if surf is not None:
+        _texts.move_to_end(key)
+        return surf
+    surf = get_font(family, size, bold).render(text, antialias, color)
+    _texts[key] = surf
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surf
+
+
+def clear():
+    _fonts.clear()
+    _texts.clear()
@@ -0,0 +1,80 @@
+import os, math, time
+import pygame
+
+FPS = 60
+
+# modo -> (fps con actividad, fps en reposo). 0 en reposo = dormir hasta el próximo evento
+MODE_RATES = {
+    "game":        (FPS, FPS),
+    "menu":        (FPS, 20),   # antorchas a 10 fps y niebla a 20 px/s: 20 fps se ven igual
+    "levelselect": (FPS, 20),
+    "cinema":      (FPS, 0),    # texto fijo: solo hay que despertar cuando cambia
+}
+
+INPUT_EVENTS = {
+    pygame.KEYDOWN, pygame.KEYUP,
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN, pygame.FINGERUP, pygame.FINGERMOTION,
+    pygame.WINDOWEXPOSED, pygame.WINDOWRESIZED, pygame.WINDOWFOCUSGAINED,
+    pygame.QUIT,
+}
+
+
+def rates_from_env(rates=MODE_RATES):
+    # TEMPLO_FRAME_RATES="menu=60:10,cinema=30:0" cambia los fps de los modos indicados
+    out = dict(rates)
+    spec = os.environ.get("TEMPLO_FRAME_RATES", "")
+    for item in filter(None, spec.split(",")):
+        mode, _, value = item.partition("=")
+        full, _, idle = value.partition(":")
+        try:
+            full = int(full)
+            out[mode.strip()] = (full, int(idle) if idle else full)
+        except ValueError:
+            print(f"Advertencia: TEMPLO_FRAME_RATES no válido en {item!r} (se esperaba modo=fps[:fps_reposo])")
+    return out
+
+
+class FrameScheduler:
+    # Sustituye a clock.tick(FPS): a pleno ritmo en juego o justo después de una entrada;
+    # en reposo la pantalla dice si tiene animaciones y se baja el ritmo o se duerme en
+    # pygame.event.wait, que vuelve en cuanto llega un evento (sin esperar al siguiente frame).
+    def __init__(self, clock, rates=None, hold=0.5):
+        self.clock = clock
+        self.rates = rates_from_env() if rates is None else rates
+        self.hold = hold
+        self.mode = None
+        self.pending = []
+        self.last_input = time.monotonic()
+
+    def take(self):
+        # El evento que despertó a event.wait va delante de los que siguen en la cola
+        events, self.pending = self.pending, []
+        return events
+
+    def note(self, events):
+        if any(e.type in INPUT_EVENTS for e in events):
+            self.last_input = time.monotonic()
+
+    def tick(self, mode, animating=True, wake_in=None):
+        full, idle = self.rates.get(mode, (FPS, FPS))
+        if mode != self.mode:
+            # Al cambiar de pantalla se dibuja ya la nueva, como tras una entrada
+            self.mode = mode
+            self.last_input = time.monotonic()
+        busy = time.monotonic() - self.last_input < self.hold
+        if busy or idle >= full or (animating and idle <= 0):
+            return self.clock.tick(full)/1000.0
+
+        # Reposo: esperar un frame del ritmo bajo, hasta wake_in, o indefinidamente
+        timeout = 1.0/idle if animating else None
+        if wake_in is not None:
+            timeout = wake_in if timeout is None else min(timeout, wake_in)
+        ms = max(1, math.ceil(timeout*1000)) if timeout is not None else 0
+        e = pygame.event.wait(ms)
+        if e.type != pygame.NOEVENT:
+            # No se vuelve a meter en la cola (quedaría detrás y se desordenarían
+            # p.ej. MOUSEBUTTONDOWN/UP): el bucle lo recoge con take()
+            self.pending.append(e)
+            if e.type in INPUT_EVENTS: self.last_input = time.monotonic()
+        return self.clock.tick()/1000.0
@@ -0,0 +1,41 @@
+import os
+
+
+class FileWatcher:
+    # Sondeo de mtimes: sin hilos ni dependencias, basta con llamar a poll() cada frame.
+    # Un cambio se avisa cuando (mtime, tamaño) se repite en dos sondeos seguidos,
+    # para no leer un archivo que el editor aún está escribiendo.
+    def __init__(self, paths, interval=1/30):
+        self.interval = interval
+        self.elapsed = 0.0
+        self.mtimes = {p: self._mtime(p) for p in paths}
+        self.settling = {}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def poll(self, dt):
+        self.elapsed += dt
+        if self.elapsed < self.interval: return []
+        self.elapsed = 0.0
+        changed = []
+        for p, old in self.mtimes.items():
+            m = self._mtime(p)
+            if m is None or m == old:
+                self.settling.pop(p, None)
+            elif self.settling.get(p) == m:
+                del self.settling[p]
+                self.mtimes[p] = m
+                changed.append(p)
+            else:
+                self.settling[p] = m
+        return changed
+
+
+def dev_mode():
+    return bool(os.environ.get("TEMPLO_DEV"))
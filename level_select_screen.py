@@ -1,12 +1,22 @@
 import os
 import pygame
+from asset_loader import loader
+from atlas import get_atlas
+from render_backend import mouse_pos
+from font_cache import render_text
+from thumbnails import get_thumbnail
 
 ASSETS = "assets"
 TILES  = os.path.join(ASSETS, "tiles")
+MAPS   = os.path.join(ASSETS, "maps")
 MENU   = os.path.join(ASSETS, "menu")
 
 W, H = 480, 800
 
+# (familia, tamaño, negrita) de cada texto: única definición de cada fuente
+BUTTON_FONT = ("arial", 24, True)
+TITLE_FONT  = ("georgia", 34, True)
+
 
 class SelectLevelCommand:
     def __init__(self, callback, level_id):
@@ -33,14 +43,13 @@ class LevelButton:
 
         self.thumbnail = pygame.transform.scale(thumbnail, (96, 64))
 
-        self.normal = pygame.image.load(os.path.join(MENU, "btn_stone.png")).convert_alpha()
-        self.hover = pygame.image.load(os.path.join(MENU, "btn_stone_hover.png")).convert_alpha()
+        self.normal = get_atlas().frame("menu/btn_stone")
+        self.hover = get_atlas().frame("menu/btn_stone_hover")
         self.image = self.normal
 
         self.rect = self.image.get_rect(center=(W//2, pos_y))
 
-        self.font = pygame.font.SysFont("arial", 24, bold=True)
-        self.label = self.font.render(text, True, (20, 18, 16))
+        self.label = render_text(text, (20, 18, 16), *BUTTON_FONT)
 
         self._pressed = False
 
@@ -53,7 +62,7 @@ class LevelButton:
         )
 
     def handle(self, events):
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         inside = self.rect.collidepoint(mx, my)
 
         self.image = self.hover if inside else self.normal
@@ -68,24 +77,37 @@ class LevelButton:
                 self._pressed = False
 
 
+LEVEL_SELECT_ASSETS = [
+    os.path.join(MENU, "background.png"),
+    os.path.join(MENU, "fog.png"),
+]
+
+# (mapa, tileset) de cada nivel, para las miniaturas
+LEVEL_FILES = [
+    (os.path.join(MAPS, "level1_temple.csv"), os.path.join(TILES, "temple_tiles.png")),
+    (os.path.join(MAPS, "level2_ruins.csv"), os.path.join(TILES, "ruins_tiles.png")),
+    (os.path.join(MAPS, "level3_crypt.csv"), os.path.join(TILES, "crypt_tiles.png")),
+]
+
+
 class LevelSelectScreen:
     def __init__(self, back_cb, start_level_cb):
+        loader.prefetch(*LEVEL_SELECT_ASSETS)
 
-        self.bg = pygame.image.load(os.path.join(MENU, "background.png")).convert_alpha()
-        self.fog = pygame.image.load(os.path.join(MENU, "fog.png")).convert_alpha()
+        self.bg = loader.image(os.path.join(MENU, "background.png"))
+        self.fog = loader.image(os.path.join(MENU, "fog.png"))
         self.fog_x = 0
 
         try:
-            self.sfx_click = pygame.mixer.Sound(os.path.join(MENU, "sound_select.wav"))
+            # Copia propia de las muestras ya decodificadas: su volumen no afecta al del menú
+            shared = loader.sound(os.path.join(MENU, "sound_select.wav"))
+            self.sfx_click = pygame.mixer.Sound(buffer=shared.get_raw())
             self.sfx_click.set_volume(0.7)
         except:
             self.sfx_click = None
 
-        self.thumbs = [
-            pygame.image.load(os.path.join(TILES, "temple_tiles.png")).convert_alpha(),
-            pygame.image.load(os.path.join(TILES, "ruins_tiles.png")).convert_alpha(),
-            pygame.image.load(os.path.join(TILES, "crypt_tiles.png")).convert_alpha(),
-        ]
+        # Minimapas generados desde los CSV (en caché en assets/cache/thumbs)
+        self.thumbs = [get_thumbnail(csv_path, tiles_path) for csv_path, tiles_path in LEVEL_FILES]
 
         spacing_y = 300
         gap = 88
@@ -122,12 +144,15 @@ class LevelSelectScreen:
             self.sfx_click
         )
 
-        self.title_font = pygame.font.SysFont("georgia", 34, bold=True)
-        self.title = self.title_font.render("Seleccionar nivel", True, (235, 220, 200))
+        self.title = render_text("Seleccionar nivel", (235, 220, 200), *TITLE_FONT)
 
     def update(self, dt):
         self.fog_x = (self.fog_x + 18 * dt) % self.fog.get_width()
 
+    def animating(self):
+        # La niebla se desplaza siempre
+        return True
+
     def draw(self, screen):
         screen.blit(self.bg, (0, 0))
 
@@ -0,0 +1,111 @@
+import pygame
+from tilemap import TILE, CHUNK_ROWS
+
+LIGHT_TILES = {13}   # antorchas
+
+AMBIENT = (44, 40, 58)
+TORCH_LIGHT = ((255, 190, 120), 140)
+PLAYER_LIGHT = ((190, 180, 160), 130)
+
+
+def radial_gradient(color, radius, steps=24):
+    # Círculos concéntricos de fuera hacia dentro: se calcula una vez y luego solo se hace blit
+    size = radius*2
+    surf = pygame.Surface((size, size))
+    surf.fill((0, 0, 0))
+    for i in range(steps):
+        r = int(radius * (1 - i/steps))
+        k = ((i + 1) / steps) ** 1.6
+        c = tuple(int(v*k) for v in color)
+        pygame.draw.circle(surf, c, (radius, radius), max(1, r))
+    return surf
+
+
+class Lighting:
+    # Luz estática de las antorchas horneada por trozos (mismos trozos que Level.chunk).
+    # Cada frame: un blit por trozo visible al búfer, la luz del jugador sumada
+    # y una sola pasada multiplicativa sobre la pantalla.
+    def __init__(self, level, ambient=AMBIENT, torch=TORCH_LIGHT, player=PLAYER_LIGHT):
+        self.level = level
+        self.ambient = ambient
+        self.torch_sprite = radial_gradient(*torch)
+        self.player_sprite = radial_gradient(*player)
+        self.buffer = None
+        self.layer = None
+        self.bake()
+
+    def torches(self):
+        return [
+            (x*TILE + TILE//2, y*TILE + TILE//2)
+            for y, row in enumerate(self.level.grid)
+            for x, tid in enumerate(row) if tid in LIGHT_TILES
+        ]
+
+    def bake(self):
+        lv = self.level
+        self.lights = set(self.torches())
+        self.maps = [self._bake_chunk(cy) for cy in range((lv.h + CHUNK_ROWS - 1)//CHUNK_ROWS)]
+
+    def _bake_chunk(self, cy):
+        ch = CHUNK_ROWS*TILE
+        half = self.torch_sprite.get_width()//2
+        surf = pygame.Surface((self.level.w*TILE, ch))
+        surf.fill(self.ambient)
+        top = cy*ch
+        for lx, ly in self.lights:
+            if ly + half < top or ly - half > top + ch: continue
+            surf.blit(self.torch_sprite, (lx - half, ly - half - top), special_flags=pygame.BLEND_RGB_ADD)
+        return surf
+
+    def rebake(self, cells):
+        # Recarga en caliente: solo se rehornean los trozos al alcance de las antorchas
+        # que aparecen o desaparecen en las celdas cambiadas (Level.reload_grid -> diff["cells"])
+        lv = self.level
+        count = (lv.h + CHUNK_ROWS - 1)//CHUNK_ROWS
+        if count != len(self.maps) or self.maps and self.maps[0].get_width() != lv.w*TILE:
+            self.bake()
+            return
+        moved = []
+        for x, y in cells:
+            c = (x*TILE + TILE//2, y*TILE + TILE//2)
+            torch = lv.tile_at(x, y) in LIGHT_TILES
+            if torch == (c in self.lights): continue
+            if torch: self.lights.add(c)
+            else: self.lights.discard(c)
+            moved.append(c)
+        ch = CHUNK_ROWS*TILE
+        half = self.torch_sprite.get_width()//2
+        dirty = {cy for _, ly in moved
+                 for cy in range(max(0, (ly - half)//ch), min(count - 1, (ly + half)//ch) + 1)}
+        for cy in dirty:
+            self.maps[cy] = self._bake_chunk(cy)
+
+    def compose(self, buf, camx, camy, player_pos):
+        sh = buf.get_height()
+        buf.fill(self.ambient)
+        ch = CHUNK_ROWS*TILE
+        first = max(0, camy//ch)
+        last = min(len(self.maps) - 1, (camy + sh - 1)//ch)
+        for cy in range(first, last + 1):
+            buf.blit(self.maps[cy], (-camx, cy*ch - camy))
+
+        if player_pos is not None:
+            half = self.player_sprite.get_width()//2
+            buf.blit(self.player_sprite, (player_pos[0] - camx - half, player_pos[1] - camy - half),
+                     special_flags=pygame.BLEND_RGB_ADD)
+
+    def draw(self, surf, camx, camy, player_pos=None):
+        if not isinstance(surf, pygame.Surface):
+            # Backend sdl2: la luz se compone en una textura de destino en la GPU
+            # (los mapas horneados se suben una sola vez) y se multiplica sobre el lienzo
+            if self.layer is None: self.layer = surf.layer()
+            with self.layer as buf:
+                self.compose(buf, camx, camy, player_pos)
+            surf.blit_layer(self.layer, special_flags=pygame.BLEND_RGB_MULT)
+            return
+
+        sw, sh = surf.get_size()
+        if self.buffer is None or self.buffer.get_size() != (sw, sh):
+            self.buffer = pygame.Surface((sw, sh))
+        self.compose(self.buffer, camx, camy, player_pos)
+        surf.blit(self.buffer, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
@@ -1,8 +1,19 @@
-import os, sys, csv, json, pygame, math
+import os, sys, pygame, math, weakref
 from abc import ABC, abstractmethod
 from typing import Optional
 from menu_screen import MenuScreen
-from level_select_screen import LevelSelectScreen
+from level_select_screen import LevelSelectScreen, LEVEL_SELECT_ASSETS
+from broadphase import SpatialHash, StaticGrid
+from asset_loader import loader, StartupTimer
+from atlas import get_atlas
+from render_backend import create_backend
+from particles import ParticlePool, Emitter
+from font_cache import render_text
+from hot_reload import FileWatcher, dev_mode
+from lighting import Lighting
+from tilemap import TILE, CHUNK_ROWS, TILE_INDEX, load_csv, slice_tiles
+from navigation import NavGraph, nav_profile
+from frame_pacing import FrameScheduler
 
 ASSETS = "assets"
 PLAYER = os.path.join(ASSETS, "player")
@@ -10,8 +21,8 @@ TILES  = os.path.join(ASSETS, "tiles")
 MAPS   = os.path.join(ASSETS, "maps")
 
 W, H = 480, 800
-TILE = 32
 FPS  = 60
+CINEMA_STEPS = (2, 4)   # segundos en los que cambia el texto de la cinemática final
 
 # Cerca de la línea 16 en main.py:
 SOLIDS = {1,2,3,4, 14, 18} # 14 (Borde Sup) y 18 (Trampa Invisible) son sólidos
@@ -23,13 +34,31 @@ EXIT   = {9}
 LADDERS= {10, 17}         # 17 (Lianas) ahora son escaleras
 FALLING_SPAWN = {11}
 SAW_SPAWN = {12}
+CHASER_SPAWNS = {19}      # 19: enemigo que persigue al jugador por el grafo de navegación
 
 
-pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((W, H))
-pygame.display.set_caption("El Templo del Tiempo (Vertical+)")
-clock = pygame.time.Clock()
+GAME_ASSETS = [
+    os.path.join(TILES, "temple_tiles.png"),
+    os.path.join(TILES, "ruins_tiles.png"),
+    os.path.join(TILES, "crypt_tiles.png"),
+    os.path.join(TILES, "fondo_juego.png"),
+]
+
+# La pantalla se abre en run(): importar main no inicializa pygame.
+# screen es la superficie de pantalla o, con TEMPLO_RENDERER=sdl2, un lienzo de texturas.
+backend = None
+screen = None
+clock = None
+
+def init_display():
+    global backend, screen, clock
+    if screen is not None: return screen
+    pygame.init()
+    pygame.mixer.init()
+    backend = create_backend("El Templo del Tiempo (Vertical+)")
+    screen = backend.canvas
+    clock = pygame.time.Clock()
+    return screen
 
 
 def _rect_hits_any(rect, rects):
@@ -50,22 +79,20 @@ def find_safe_spawn(level, x, y, pw=32, ph=48, max_probe=80):
     return (r.x, r.y)
 
 
-def load_csv(path):
-    with open(path) as f:
-        return [list(map(int, r)) for r in csv.reader(f)]
-
-def slice_tiles(img):
-    tw, th = img.get_size()
-    return [
-        img.subsurface((x*TILE, y*TILE, TILE, TILE))
-        for y in range(th//TILE) for x in range(tw//TILE)
-    ]
+def check_grid(grid):
+    # Un CSV a medio escribir llega vacío o con la última fila cortada
+    if not any(grid):
+        raise ValueError("mapa vacío")
+    w=max(len(row) for row in grid)
+    if len(grid[-1])<w:
+        raise ValueError(f"última fila incompleta ({len(grid[-1])} de {w} columnas)")
 
 
 class Saw(pygame.sprite.Sprite):
     def __init__(self,x,y):
         super().__init__()
         self.base = pygame.Vector2(x,y)
+        self.spawn=(x,y)
         self.t=0
         self.image = pygame.Surface((26,26), pygame.SRCALPHA)
         pygame.draw.circle(self.image,(200,200,210),(13,13),13)
@@ -75,86 +102,222 @@ class Saw(pygame.sprite.Sprite):
             dy=int(13+11*math.sin(math.radians(ang)))
             pygame.draw.line(self.image,(240,240,250),(13,13),(dx,dy),2)
         self.rect=self.image.get_rect(center=(x,y))
+        self.mask=pygame.mask.from_surface(self.image)
     def update(self,dt):
         self.t+=dt
         self.rect.centerx=int(self.base.x+math.sin(self.t*1.3)*48)
 
 class FallingPlatform:
+    solid=True
     def __init__(self,x,y):
         self.rect=pygame.Rect(x,y,TILE,TILE)
+        self.spawn=(x,y)
         self.falling=False
         self.timer=0
         self.vy=0
+        self.fx=None
     def update(self,dt):
         if self.falling:
             self.timer+=dt
             if self.timer>0.25:
                 self.vy+=980*dt
                 self.rect.y+=int(self.vy*dt)
+        if self.fx: self.fx.update(dt)
     def trigger(self):
+        if self.falling: return
         self.falling=True
         self.timer=0
-        self.vy=-120
+        self.vy=0
+        if self.fx:
+            self.fx.burst(10)
+            self.fx.active=True
 
 class Level:
     def __init__(self,tiles_png,csv_file):
-        img = pygame.image.load(tiles_png).convert_alpha()
+        self.tiles_png=tiles_png
+        self.csv_file=csv_file
+        img = loader.image(tiles_png)
         self.tiles=slice_tiles(img)
         self.grid=load_csv(csv_file)
 
         self.h = len(self.grid)
         self.w = max((len(row) for row in self.grid), default=0)
 
-        self.idx={
-    1:0, 2:1, 3:2, 4:3, 5:4, 6:5, 7:7, 8:8, 9:9,  # Tiles originales
-    10: 4,  # Pinchos (usando el mismo sprite que el original 5/4, quizás necesites uno nuevo)
-    11: 10, # Roca de Fondo
-    12: 11, # Caja de Madera
-    13: 12, # Antorcha
-    14: 3,  # Borde Superior (usando el mismo sprite que 4, por ejemplo)
-    15: 13, # Agua
-    16: 14, # Cadena Colgante
-    17: 15, # Liana/Escalera
-    18: 0,  # Bloque Invisible (mapeado a aire/transparente para que no se vea)
-}
+        self.idx=dict(TILE_INDEX)
 
         self.solid_rects=[]; self.trap_rects=[]
         self.check_rects=[]; self.exit_rects=[]
         self.ladder_rects=[]
         self.enemy_spawns=[]
+        self.chaser_spawns=[]
         self.saw_spawns=[]
         self.fall_spawns=[]
+        self.cell_items={}   # (x,y) -> [(lista, elemento)] para poder deshacer una celda
 
         for y,row in enumerate(self.grid):
             for x,tid in enumerate(row):
-                px,py=x*TILE,y*TILE
-                if tid in SOLIDS: self.solid_rects.append(pygame.Rect(px,py,TILE,TILE))
-                if tid in TRAPS: self.trap_rects.append(pygame.Rect(px+6,py+8,TILE-12,TILE-10))
-                if tid in CHECKS: self.check_rects.append(pygame.Rect(px+6,py+6,TILE-12,TILE-12))
-                if tid in EXIT: self.exit_rects.append(pygame.Rect(px,py,TILE,TILE))
-                if tid in LADDERS: self.ladder_rects.append(pygame.Rect(px+10,py,TILE-20,TILE))
-                if tid in ENEMY_SPAWNS: self.enemy_spawns.append((px,py))
-                if tid in SAW_SPAWN: self.saw_spawns.append((px+16,py+16))
-                if tid in FALLING_SPAWN: self.fall_spawns.append((px,py))
+                self._index_cell(x,y,tid)
 
         self.saws=pygame.sprite.Group([Saw(x,y) for (x,y) in self.saw_spawns])
         self.falls=[FallingPlatform(x,y) for (x,y) in self.fall_spawns]
 
+        self.chunks={}
+        self.fall_img=self._fall_image()
+
+        # Broadphase: sólidos estáticos una vez, colisionadores dinámicos por celdas
+        self.static_grid=StaticGrid(self.solid_rects)
+        self.dynamic=SpatialHash()
+        self.colliders=[]
+        for fp in self.falls: self.add_collider(fp)
+
+        self.navs={}
+
+    def navigation(self,profile):
+        # Un grafo por perfil de agente (hitbox + salto), construido la primera vez que se pide
+        nav=self.navs.get(profile)
+        if nav is None:
+            nav=self.navs[profile]=NavGraph(self.solid_rects,self.w,self.h,profile)
+        return nav
+
+    def _index_cell(self,x,y,tid):
+        px,py=x*TILE,y*TILE
+        items=[]
+        if tid in SOLIDS: items.append((self.solid_rects,pygame.Rect(px,py,TILE,TILE)))
+        if tid in TRAPS: items.append((self.trap_rects,pygame.Rect(px+6,py+8,TILE-12,TILE-10)))
+        if tid in CHECKS: items.append((self.check_rects,pygame.Rect(px+6,py+6,TILE-12,TILE-12)))
+        if tid in EXIT: items.append((self.exit_rects,pygame.Rect(px,py,TILE,TILE)))
+        if tid in LADDERS: items.append((self.ladder_rects,pygame.Rect(px+10,py,TILE-20,TILE)))
+        if tid in ENEMY_SPAWNS: items.append((self.enemy_spawns,(px,py)))
+        if tid in CHASER_SPAWNS: items.append((self.chaser_spawns,(px,py)))
+        if tid in SAW_SPAWN: items.append((self.saw_spawns,(px+16,py+16)))
+        if tid in FALLING_SPAWN: items.append((self.fall_spawns,(px,py)))
+        for lst,item in items: lst.append(item)
+        if items: self.cell_items[(x,y)]=items
+        return items
+
+    def tile_at(self,x,y):
+        if 0<=y<len(self.grid) and 0<=x<len(self.grid[y]): return self.grid[y][x]
+        return 0
+
+    def reload_grid(self,grid):
+        # Recarga en caliente: solo se rehacen las celdas que cambian y los trozos que las contienen
+        check_grid(grid)
+        old_w=self.w
+        h=len(grid)
+        w=max((len(row) for row in grid), default=0)
+        new=lambda x,y: grid[y][x] if y<len(grid) and x<len(grid[y]) else 0
+        changed=[
+            (x,y) for y in range(max(h,self.h)) for x in range(max(w,self.w))
+            if self.tile_at(x,y)!=new(x,y)
+        ]
+        diff={"cells":changed,"enemies_added":[],"enemies_removed":[],"chasers_added":[],"falls_added":[]}
+
+        for cell in changed:
+            for lst,item in self.cell_items.pop(cell,()):
+                lst.remove(item)
+                if lst is self.solid_rects: self.static_grid.remove(item)
+                elif lst is self.enemy_spawns or lst is self.chaser_spawns: diff["enemies_removed"].append(item)
+                elif lst is self.saw_spawns:
+                    for s in [s for s in self.saws if s.spawn==item]: s.kill()
+                elif lst is self.fall_spawns:
+                    for fp in [fp for fp in self.falls if fp.spawn==item]: self.remove_collider(fp)
+
+        self.grid=grid; self.h=h; self.w=w
+
+        for (x,y) in changed:
+            for lst,item in self._index_cell(x,y,new(x,y)):
+                if lst is self.solid_rects: self.static_grid.add(item)
+                elif lst is self.enemy_spawns: diff["enemies_added"].append(item)
+                elif lst is self.chaser_spawns: diff["chasers_added"].append(item)
+                elif lst is self.saw_spawns: self.saws.add(Saw(*item))
+                elif lst is self.fall_spawns:
+                    fp=FallingPlatform(*item)
+                    self.falls.append(fp); self.add_collider(fp)
+                    diff["falls_added"].append(fp)
+
+        self.navs.clear()
+        if w!=old_w:
+            self.chunks.clear()
+        else:
+            for (x,y) in changed: self.chunks.pop(y//CHUNK_ROWS,None)
+        return diff
+
+    def reload_tiles(self):
+        # Si el PNG no se puede leer, salta la excepción antes de tocar los tiles actuales
+        loader.forget(self.tiles_png)
+        tiles=slice_tiles(loader.image(self.tiles_png))
+        self.tiles=tiles
+        self.fall_img=self._fall_image()
+        self.chunks.clear()
+
+    def add_collider(self,obj):
+        self.colliders.append(obj)
+        self.dynamic.insert(obj)
+
+    def remove_collider(self,obj):
+        self.dynamic.remove(obj)
+        if obj in self.colliders: self.colliders.remove(obj)
+        if obj in self.falls: self.falls.remove(obj)
+
+    def solids_near(self,rect):
+        near=self.static_grid.query(rect)
+        dyn=self.dynamic.query(rect)
+        if dyn:
+            near=near+[o.rect for o in dyn if o.solid]
+        return near
+
+    def stand_on(self,rect):
+        feet=pygame.Rect(rect.x,rect.bottom,rect.w,1)
+        for obj in self.dynamic.query(feet):
+            if hasattr(obj,"trigger") and feet.colliderect(obj.rect):
+                obj.trigger()
+
+    def _fall_image(self):
+        idx=self.idx[11]
+        if idx<len(self.tiles): return self.tiles[idx]
+        img=pygame.Surface((TILE,TILE),pygame.SRCALPHA)
+        pygame.draw.rect(img,(200,160,50),(0,0,TILE,TILE),2)
+        return img
+
+    def chunk(self,cy):
+        # Trozo horizontal de CHUNK_ROWS filas con todos los tiles estáticos ya compuestos
+        surf=self.chunks.get(cy)
+        if surf is None:
+            surf=pygame.Surface((self.w*TILE,CHUNK_ROWS*TILE),pygame.SRCALPHA)
+            for y in range(cy*CHUNK_ROWS,min(self.h,(cy+1)*CHUNK_ROWS)):
+                for x, tid in enumerate(self.grid[y]):
+                    if tid==0 or tid in FALLING_SPAWN: continue
+                    idx=self.idx.get(tid)
+                    if idx is None or idx>=len(self.tiles): continue
+                    surf.blit(self.tiles[idx],(x*TILE,(y-cy*CHUNK_ROWS)*TILE))
+            self.chunks[cy]=surf
+        return surf
+
     def draw(self,surf,camx,camy):
-        for y, row in enumerate(self.grid):
-            for x, tid in enumerate(row):
-                if tid==0: continue
-                idx=self.idx.get(tid)
-                if idx is None or idx>=len(self.tiles): continue
-                surf.blit(self.tiles[idx],(x*TILE-camx,y*TILE-camy))
+        ch=CHUNK_ROWS*TILE
+        first=max(0,camy//ch)
+        last=min((self.h-1)//CHUNK_ROWS,(camy+surf.get_height()-1)//ch)
+        for cy in range(first,last+1):
+            surf.blit(self.chunk(cy),(-camx,cy*ch-camy))
         for fp in self.falls:
-            pygame.draw.rect(surf,(200,160,50),(fp.rect.x-camx,fp.rect.y-camy,TILE,TILE),2)
+            surf.blit(self.fall_img,(fp.rect.x-camx,fp.rect.y-camy))
         for s in self.saws:
             surf.blit(s.image,(s.rect.x-camx,s.rect.y-camy))
 
     def update(self,dt):
         self.saws.update(dt)
-        for fp in self.falls: fp.update(dt)
+        bottom=self.h*TILE
+        for obj in self.colliders[:]:
+            obj.update(dt)
+            if obj.rect.top>bottom:
+                self.remove_collider(obj)
+            else:
+                self.dynamic.move(obj)
+
+
+def step_towards(x,goal,step):
+    # Desplazamiento hacia una x exacta, como mucho step píxeles (mismo paso que NavGraph.simulate)
+    return max(-step,min(step,goal-x))
 
 
 class Enemy(pygame.sprite.Sprite):
@@ -163,25 +326,61 @@ class Enemy(pygame.sprite.Sprite):
         self.image=pygame.Surface((26,26),pygame.SRCALPHA)
         pygame.draw.rect(self.image,(200,50,50),(0,0,26,26))
         self.rect=self.image.get_rect(topleft=(x,y))
+        self.spawn=(x,y)
         self.vx=100
         self.vy=0
         self.g=980
         self.dir=1
+        self.goal_x=None
+        self.on_ground=False
 
-    def update(self,dt,level:'Level'):
-        self.vy+=self.g*dt
+    def think(self,level:'Level'):
+        # Patrulla: media vuelta al llegar a un borde
+        self.goal_x=None
         ahead=self.rect.move(self.dir*20,1)
         foot=ahead.move(0,22)
-        if not any(foot.colliderect(r) for r in level.solid_rects):
+        if foot.collidelist(level.solids_near(foot))<0:
             self.dir*=-1
-        dx=int(self.dir*self.vx*dt)
+
+    def update(self,dt,level:'Level'):
+        self.vy+=self.g*dt
+        self.think(level)
+        dx=step_towards(self.rect.x,self.goal_x,int(self.vx*dt)) if self.goal_x is not None \
+            else int(self.dir*self.vx*dt)
         self.rect.x+=dx
-        if self.rect.collidelist(level.solid_rects)>=0:
+        if self.rect.collidelist(level.solids_near(self.rect))>=0:
             self.rect.x-=dx; self.dir*=-1
         dy=int(self.vy*dt)
         self.rect.y+=dy
-        if self.rect.collidelist(level.solid_rects)>=0:
+        self.on_ground=False
+        if self.rect.collidelist(level.solids_near(self.rect))>=0:
             self.rect.y-=dy; self.vy=0
+            self.on_ground=dy>0
+        if dy==0:
+            below=self.rect.move(0,1)
+            self.on_ground=below.collidelist(level.solids_near(below))>=0
+
+
+class ChaserEnemy(Enemy):
+    # Persigue al objetivo siguiendo el grafo de navegación; sin ruta, patrulla
+    def __init__(self,x,y,target):
+        super().__init__(x,y)
+        self.image.fill((230,120,40))
+        self.target=target
+        self.jump=330
+        self.nav_profile=nav_profile(self.rect.w,self.rect.h,self.vx,self.jump,self.g)
+
+    def think(self,level:'Level'):
+        # En el aire se sigue hacia la x fijada al despegar (la que se simuló en el grafo)
+        if not self.on_ground: return
+        step=level.navigation(self.nav_profile).steer(self.rect,self.target.rect)
+        if step is None:
+            # Medio cuerpo sobre el hueco de una caída: se termina el paso empezado
+            if self.goal_x is not None and self.rect.x!=self.goal_x: return
+            super().think(level)
+            return
+        self.goal_x,jump=step
+        if jump: self.vy=-self.jump
 
 
 class BossGuardian(pygame.sprite.Sprite):
@@ -198,12 +397,17 @@ class BossGuardian(pygame.sprite.Sprite):
         self.g=980
         self.dir=1
         self.enraged=False
-        self.teleport_cd=0
+        self.on_ground=False
+        self.goal_x=None
+        self.chasing=False
+        self.jump=380
         self.flash=0
+        self.hit_fx=None
 
     def take_hit(self):
         self.hp-=1
         self.flash=0.4
+        if self.hit_fx: self.hit_fx.burst(24)
         if self.hp <= self.max_hp//2:
             self.enraged=True
             self.vx=150
@@ -216,26 +420,41 @@ class BossGuardian(pygame.sprite.Sprite):
             self.image.set_alpha(255)
 
         self.vy+=self.g*dt
-        ahead=self.rect.move(self.dir*20,1)
-        foot=ahead.move(0,40)
-        if not any(foot.colliderect(r) for r in level.solid_rects):
-            self.dir*=-1
-
-        dx=int(self.dir*self.vx*dt)
+        if not self.enraged:
+            self.chasing=False
+        elif self.on_ground:
+            # Enfurecido: persigue al jugador por rutas válidas (andar, saltar, caer);
+            # en el aire sigue hacia la x fijada al despegar. Sin ruta, patrulla.
+            nav=level.navigation(nav_profile(self.rect.w,self.rect.h,self.vx,self.jump,self.g))
+            step=nav.steer(self.rect,player.rect)
+            if step is not None:
+                self.goal_x,jump=step
+                if jump: self.vy=-self.jump
+            # Medio cuerpo sobre el hueco de una caída: se termina el paso empezado
+            self.chasing=step is not None or self.goal_x is not None and self.rect.x!=self.goal_x
+        if not self.chasing:
+            self.goal_x=None
+            ahead=self.rect.move(self.dir*20,1)
+            foot=ahead.move(0,40)
+            if foot.collidelist(level.solids_near(foot))<0:
+                self.dir*=-1
+
+        dx=step_towards(self.rect.x,self.goal_x,int(self.vx*dt)) if self.goal_x is not None \
+            else int(self.dir*self.vx*dt)
         self.rect.x+=dx
-        if self.rect.collidelist(level.solid_rects)>=0:
-            self.rect.x-=dx; self.dir*=-1
+        if self.rect.collidelist(level.solids_near(self.rect))>=0:
+            self.rect.x-=dx
+            if not self.chasing: self.dir*=-1
 
         dy=int(self.vy*dt)
         self.rect.y+=dy
-        if self.rect.collidelist(level.solid_rects)>=0:
+        self.on_ground=False
+        if self.rect.collidelist(level.solids_near(self.rect))>=0:
             self.rect.y-=dy; self.vy=0
-
-        if self.enraged:
-            self.teleport_cd-=dt
-            if self.teleport_cd<=0:
-                self.rect.centerx=player.rect.centerx+self.dir*80
-                self.teleport_cd=2.5
+            self.on_ground=dy>0
+        if dy==0:
+            below=self.rect.move(0,1)
+            self.on_ground=below.collidelist(level.solids_near(below))>=0
 
     def draw(self,surf,camx,camy):
         surf.blit(self.image,(self.rect.x-camx,self.rect.y-camy))
@@ -245,20 +464,18 @@ class Player(pygame.sprite.Sprite):
     def __init__(self,x,y):
         super().__init__()
 
-        meta=json.load(open(os.path.join(PLAYER,"player_meta.json")))
-        ss=pygame.image.load(os.path.join(PLAYER,meta["spritesheet"])).convert_alpha()
-
-        self.frames={}
-        for anim, rects in meta["rects"].items():
-            self.frames[anim]=[
-                ss.subsurface((r["x"],r["y"],r["w"],r["h"]))
-                for r in rects
-            ]
+        # Frames servidos desde el atlas (assets/atlas, generado con atlas.py)
+        atlas=get_atlas()
+        self.frames={
+            anim.split("/",1)[1]: atlas.frames(anim)
+            for anim in atlas.rects if anim.startswith("player/")
+        }
 
         self.anim="idle"
         self.fps=6
         self.fi=0
         self.ft=0
+        self.flipped={}
         self.image=self.frames["idle"][0]
         self.rect=self.image.get_rect(topleft=(x,y))
 
@@ -284,6 +501,10 @@ class Player(pygame.sprite.Sprite):
 
         self.checkpoint=pygame.Vector2(x,y)
 
+        # Emisores de partículas (opcionales, los asigna start_level)
+        self.rewind_fx=None
+        self.death_fx=None
+
     def has_anim(self, name):
         return name in self.frames and len(self.frames[name])>0
 
@@ -302,7 +523,13 @@ class Player(pygame.sprite.Sprite):
             self.fi=(self.fi+1)%len(frames)
             self.image=frames[self.fi]
         if self.vx<0:
-            self.image=pygame.transform.flip(frames[self.fi],True,False)
+            self.image=self.flipped_frame(self.anim,self.fi)
+
+    def flipped_frame(self,anim,i):
+        fr=self.flipped.get(anim)
+        if fr is None:
+            fr=self.flipped[anim]=[pygame.transform.flip(f,True,False) for f in self.frames[anim]]
+        return fr[i]
 
     def step(self,dx,dy,solids):
         if dx:
@@ -330,6 +557,7 @@ class Player(pygame.sprite.Sprite):
         if self.hp <= 0:
             self.dead = True
             self.death_timer = 0.0
+            if self.death_fx: self.death_fx.burst(40)
 
     def update_alive(self,dt,keys,level):
         if keys[pygame.K_r] and self.history:
@@ -373,12 +601,18 @@ class Player(pygame.sprite.Sprite):
         else: self.set_anim("idle",6)
 
         self.vy+=self.g*dt
-        self.step(int(self.vx*dt),0,level.solid_rects)
+        dx=int(self.vx*dt)
+        self.step(dx,0,level.solids_near(self.rect.inflate(abs(dx)*2,0)))
         self.on_ground=False
-        self.step(0,int(self.vy*dt),level.solid_rects)
+        dy=int(self.vy*dt)
+        self.step(0,dy,level.solids_near(self.rect.inflate(0,abs(dy)*2)))
+        if self.on_ground: level.stand_on(self.rect)
         self.animate(dt)
 
     def update(self,dt,keys,level):
+        if self.rewind_fx:
+            self.rewind_fx.active=self.rewinding and not self.dead
+            self.rewind_fx.update(dt)
         if self.dead:
             self.death_timer+=dt
             if int(self.death_timer*10)%2==0:
@@ -408,9 +642,19 @@ def draw_heart(surf,x,y,filled=True):
     pygame.draw.circle(surf,c,(x+11,y+7),6)
     pygame.draw.circle(surf,c,(x+19,y+7),6)
 
+_hearts={}
+
+def heart_sprite(filled):
+    # Se dibuja una vez y luego solo se hace blit (vale para cualquier backend)
+    img=_hearts.get(filled)
+    if img is None:
+        img=_hearts[filled]=pygame.Surface((32,32),pygame.SRCALPHA)
+        draw_heart(img,0,0,filled)
+    return img
+
 def draw_hud(surf,hp,max_hp):
     for i in range(max_hp):
-        draw_heart(surf,16+i*26,16,filled=(i<hp))
+        surf.blit(heart_sprite(i<hp),(16+i*26,16))
 
 
 class DamageStrategy(ABC):
@@ -418,10 +662,58 @@ class DamageStrategy(ABC):
     def apply(self, player:'Player', now_ms:int): ...
 
 class TrapDamage(DamageStrategy):
-    def __init__(self, level:'Level'): self.level = level
+    def __init__(self, level:'Level', fx:Optional[Emitter]=None):
+        self.level = level
+        self.fx = fx
     def apply(self, player:'Player', now_ms:int):
         if any(player.rect.colliderect(r) for r in self.level.trap_rects):
             player.take_damage(1, now_ms, knockback=(0,-240))
+            if self.fx and player.last_hit == now_ms:
+                self.fx.emit_at(player.rect.midbottom, 16)
+
+class HazardDamage(DamageStrategy):
+    # Peligros con forma irregular: primero rect contra rect (barato) y solo si se solapan, máscara.
+    # La máscara de cada imagen se calcula una vez (o se usa sprite.mask si ya existe);
+    # la caché va por la propia superficie (débil), no por id(), que se reutiliza tras liberarla.
+    def __init__(self, hazards, amount=1, fx:Optional[Emitter]=None):
+        self.hazards = hazards
+        self.amount = amount
+        self.fx = fx
+        self._masks = weakref.WeakKeyDictionary()
+        self._hitboxes = {}
+
+    def mask_of(self, hazard):
+        m = getattr(hazard, "mask", None)
+        if m is None:
+            m = self._masks.get(hazard.image)
+            if m is None:
+                m = self._masks[hazard.image] = pygame.mask.from_surface(hazard.image)
+        return m
+
+    def hitbox(self, size):
+        m = self._hitboxes.get(size)
+        if m is None:
+            m = self._hitboxes[size] = pygame.mask.Mask(size, fill=True)
+        return m
+
+    def knockback(self, player:'Player', hazard):
+        direction = 1 if player.rect.centerx < hazard.rect.centerx else -1
+        return (-200*direction, -220)
+
+    def apply(self, player:'Player', now_ms:int):
+        pr = player.rect
+        for h in self.hazards:
+            if not pr.colliderect(h.rect): continue
+            if self.hitbox(pr.size).overlap(self.mask_of(h), (h.rect.x-pr.x, h.rect.y-pr.y)) is None:
+                continue
+            player.take_damage(self.amount, now_ms, knockback=self.knockback(player, h))
+            if self.fx and player.last_hit == now_ms:
+                self.fx.emit_at(h.rect.center, 16)
+            return
+
+class SawDamage(HazardDamage):
+    def __init__(self, level:'Level', fx:Optional[Emitter]=None):
+        super().__init__(level.saws, 1, fx)
 
 class EnemyCollisionDamage(DamageStrategy):
     def __init__(self, enemies:pygame.sprite.Group): self.enemies = enemies
@@ -469,6 +761,10 @@ class AttackCommand(Command):
 
 
 def run():
+    startup=StartupTimer()
+    init_display()
+    startup.mark("display")
+
     mode="menu"
     level=None
     player=None
@@ -482,10 +778,16 @@ def run():
     bg_img = None 
 
     combat = CombatSystem()
+    particles = ParticlePool()
+
+    watcher = None
+    lighting = None
 
+    hit_overlay = pygame.Surface((W,H), pygame.SRCALPHA)
+    hit_overlay.fill((255,255,255,35))
 
     def start_level(n):
-        nonlocal level,player,mode,camx,camy,enemies,level_index,self_boss,combat, bg_img 
+        nonlocal level,player,mode,camx,camy,enemies,level_index,self_boss,combat, bg_img, watcher, lighting
         level_index=n
 
         if n==1:
@@ -502,9 +804,11 @@ def run():
             bg_path = os.path.join(TILES, "fondo_juego.png") # Cambia "crypt_bg.png" si tienes otro nombre
 
         level=Level(til,lvl)
+        # Solo la cripta va a oscuras: la luz de las antorchas se hornea al cargar
+        lighting=Lighting(level) if n==3 else None
         
         try:
-            bg_img = pygame.image.load(bg_path).convert()
+            bg_img = loader.image(bg_path, alpha=False)
             
             # AÑADIR: Habilitar la transparencia y establecer el valor (200 es semi-transparente)
             bg_img.set_alpha(200) 
@@ -517,26 +821,64 @@ def run():
         player=Player(sx,sy)
         player.checkpoint.update(sx,sy)
 
+        particles.clear()
+        player.rewind_fx=Emitter(particles,(120,200,255),player,rate=90,speed=(10,50),life=(0.3,0.6))
+        player.death_fx=Emitter(particles,(220,60,80),player,speed=(80,220),life=(0.5,1.0))
+        for fp in level.falls: attach_fall_fx(fp)
+
         enemies.empty()
         for ex,ey in level.enemy_spawns:
             enemies.add(Enemy(ex,ey))
+        for ex,ey in level.chaser_spawns:
+            enemies.add(ChaserEnemy(ex,ey,player))
 
         if n==3:
             bx=(level.w//2)*TILE
             by=(level.h-4)*TILE
             self_boss=BossGuardian(bx,by)
+            self_boss.hit_fx=Emitter(particles,(255,240,160),self_boss,speed=(100,260),life=(0.3,0.7))
         else:
             self_boss=None
 
         combat.clear()
-        combat.add(TrapDamage(level))
+        combat.add(TrapDamage(level, Emitter(particles,(255,255,255),angle=(200,340),speed=(60,160))))
+        combat.add(SawDamage(level, Emitter(particles,(255,230,120),speed=(80,200),life=(0.2,0.5))))
         combat.add(EnemyCollisionDamage(enemies))
 
+        # Modo desarrollo: vigilar el CSV y el tileset del nivel actual
+        watcher=FileWatcher([lvl,til]) if dev_mode() else None
+
         camx=camy=0
         mode="game"
 
+    def attach_fall_fx(fp):
+        fp.fx=Emitter(particles,(150,130,100),fp,anchor="midbottom",rate=20,
+                      speed=(10,40),angle=(200,340),life=(0.3,0.6))
+
+    def hot_reload(path):
+        # Conserva jugador y cámara: solo se rehacen las celdas cambiadas
+        if path==level.tiles_png:
+            try:
+                level.reload_tiles()
+            except (pygame.error, OSError) as err:
+                print(f"Advertencia: no se pudo recargar {path}: {err}")
+            return
+        try:
+            diff=level.reload_grid(load_csv(path))
+        except (ValueError, OSError) as err:
+            print(f"Advertencia: no se pudo recargar {path}: {err}")
+            return
+        if lighting: lighting.rebake(diff["cells"])
+        gone=set(diff["enemies_removed"])
+        for e in [e for e in enemies if e.spawn in gone]: e.kill()
+        for ex,ey in diff["enemies_added"]: enemies.add(Enemy(ex,ey))
+        for ex,ey in diff["chasers_added"]: enemies.add(ChaserEnemy(ex,ey,player))
+        for fp in diff["falls_added"]: attach_fall_fx(fp)
+
     def go_levels():
-        nonlocal mode
+        nonlocal mode, level_select
+        if level_select is None:
+            level_select=LevelSelectScreen(_back_to_menu, start_level)
         mode="levelselect"
 
     def _back_to_menu():
@@ -544,16 +886,28 @@ def run():
         mode="menu"
 
     def quit_game():
+        loader.shutdown()
         pygame.quit(); sys.exit()
 
+    # Solo el menú se construye antes del primer frame; el resto se decodifica en segundo plano
     menu=MenuScreen(lambda:start_level(1), go_levels, lambda:None, quit_game)
-    level_select=LevelSelectScreen(_back_to_menu, start_level)
+    level_select=None
+    startup.mark("menu")
+    first_frame=True
 
     running=True
+    scheduler=FrameScheduler(clock)
     while running:
-        dt=clock.tick(FPS)/1000.0
+        # Ritmo de frames según el modo: en reposo el menú baja de fps y la cinemática duerme
+        if mode=="menu": dt=scheduler.tick(mode,menu.animating())
+        elif mode=="levelselect": dt=scheduler.tick(mode,level_select.animating())
+        elif mode=="cinema":
+            wake_in=next((t-cinema_timer for t in CINEMA_STEPS if t>cinema_timer),None)
+            dt=scheduler.tick(mode,False,wake_in)
+        else: dt=scheduler.tick(mode)
         keys=pygame.key.get_pressed()
-        events=pygame.event.get()
+        events=scheduler.take()+pygame.event.get()
+        scheduler.note(events)
         for e in events:
             if e.type==pygame.QUIT: running=False
 
@@ -567,9 +921,12 @@ def run():
 
         # Juego
         elif mode=="game":
+            if watcher:
+                for path in watcher.poll(dt): hot_reload(path)
             level.update(dt)
             player.update(dt,keys,level)
             enemies.update(dt,level)
+            particles.update(dt)
 
             # Daño (Strategy)
             now = pygame.time.get_ticks()
@@ -614,8 +971,6 @@ def run():
             else:
                 screen.fill((20,20,30)) # Color sólido de respaldo si no hay imagen
 
-            level.draw(screen,int(camx),int(camy))
-            # ...
             level.draw(screen,int(camx),int(camy)) # Dibuja los tiles/plataformas
             for enemy in enemies:
                 screen.blit(enemy.image,(enemy.rect.x-int(camx),enemy.rect.y-int(camy)))
@@ -626,28 +981,34 @@ def run():
 
             # Overlay de i-frames (feedback visual)
             if pygame.time.get_ticks() - player.last_hit < player.inv_ms and not player.dead:
-                overlay = pygame.Surface((W,H), pygame.SRCALPHA)
-                overlay.fill((255,255,255,35))
-                screen.blit(overlay,(0,0))
+                screen.blit(hit_overlay,(0,0))
 
+            particles.draw(screen,int(camx),int(camy))
+            if lighting:
+                lighting.draw(screen,int(camx),int(camy),player.rect.center)
             draw_hud(screen,player.hp,player.max_hp)
 
         #  Cinemática Final
         elif mode=="cinema":
             cinema_timer+=dt
             screen.fill((255,255,255))
-            font=pygame.font.SysFont("georgia",38,bold=True)
-
-            if cinema_timer<2:
-                txt=font.render("¡Has vencido al Guardián del Tiempo!",True,(0,0,0))
-            elif cinema_timer<4:
-                txt=font.render("El templo se derrumba...",True,(0,0,0))
+            if cinema_timer<CINEMA_STEPS[0]:
+                msg="¡Has vencido al Guardián del Tiempo!"
+            elif cinema_timer<CINEMA_STEPS[1]:
+                msg="El templo se derrumba..."
             else:
-                txt=font.render("✨ FIN ✨",True,(0,0,0))
+                msg="✨ FIN ✨"
+            txt=render_text(msg,(0,0,0),"georgia",38,bold=True)
 
             screen.blit(txt,(W//2-txt.get_width()//2,H//2-40))
 
-        pygame.display.flip()
+        backend.present()
+        if first_frame:
+            first_frame=False
+            startup.mark("first_frame")
+            startup.report()
+            loader.prefetch(*LEVEL_SELECT_ASSETS, *GAME_ASSETS, *get_atlas().paths)
+    loader.shutdown()
     pygame.quit()
 
 if __name__=="__main__":
@@ -1,11 +1,20 @@
 import os
 import pygame
+from asset_loader import loader
+from atlas import get_atlas
+from render_backend import mouse_pos
+from font_cache import render_text
 
 ASSETS = "assets"
 MENU   = os.path.join(ASSETS, "menu")
 
 W, H = 480, 800
 
+# (familia, tamaño, negrita) de cada texto: única definición de cada fuente
+BUTTON_FONT = ("arial", 28, True)
+TITLE_FONT  = ("georgia", 38, True)
+HINT_FONT   = ("arial", 16, False)
+
 
 class Command:
     def execute(self):
@@ -54,13 +63,12 @@ class StoneButton:
         self.command = command
         self.sound = sound
 
-        self.normal = pygame.image.load(os.path.join(MENU, "btn_stone.png")).convert_alpha()
-        self.hover  = pygame.image.load(os.path.join(MENU, "btn_stone_hover.png")).convert_alpha()
+        self.normal = get_atlas().frame("menu/btn_stone")
+        self.hover  = get_atlas().frame("menu/btn_stone_hover")
         self.image  = self.normal
 
         self.rect = self.image.get_rect(center=(W // 2, y))
-        self.font = pygame.font.SysFont("arial", 28, bold=True)
-        self.text = self.font.render(text, True, (20, 18, 16))
+        self.text = render_text(text, (20, 18, 16), *BUTTON_FONT)
 
         self._pressed = False
 
@@ -72,7 +80,7 @@ class StoneButton:
         ))
 
     def handle(self, events):
-        mx, my = pygame.mouse.get_pos()
+        mx, my = mouse_pos()
         inside = self.rect.collidepoint(mx, my)
 
         self.image = self.hover if inside else self.normal
@@ -87,18 +95,25 @@ class StoneButton:
                 self._pressed = False
 
 
+MENU_ASSETS = [
+    os.path.join(MENU, "background.png"),
+    os.path.join(MENU, "fog.png"),
+]
+
+
 class MenuScreen:
     def __init__(self, start_cb, levels_cb, options_cb, quit_cb):
+        # Todas las imágenes del menú se decodifican a la vez en el pool
+        loader.prefetch(*MENU_ASSETS)
+        loader.prefetch_sound(os.path.join(MENU, "sound_select.wav"))
+        atlas = get_atlas()
 
-        self.bg = pygame.image.load(os.path.join(MENU, "background.png")).convert_alpha()
-        self.fog = pygame.image.load(os.path.join(MENU, "fog.png")).convert_alpha()
+        self.bg = loader.image(os.path.join(MENU, "background.png"))
+        self.fog = loader.image(os.path.join(MENU, "fog.png"))
 
-        self.hero_img = pygame.image.load(os.path.join(ASSETS, "player", "idle_01.png")).convert_alpha()
-        self.hero_img = pygame.transform.scale(self.hero_img, (64, 96))
+        self.hero_img = pygame.transform.scale(atlas.frame("player/idle"), (64, 96))
 
-        self.title_font = pygame.font.SysFont("georgia", 38, bold=True)
-        self.sub_font   = pygame.font.SysFont("arial", 16)
-        self.title_text = self.title_font.render("El Templo del Tiempo", True, (235,220,200))
+        self.title_text = render_text("El Templo del Tiempo", (235,220,200), *TITLE_FONT)
 
         try:
             pygame.mixer.music.load(os.path.join(MENU, "menu_music.mp3"))
@@ -107,16 +122,17 @@ class MenuScreen:
         except: pass
 
         try:
-            self.sfx_select = pygame.mixer.Sound(os.path.join(MENU, "sound_select.wav"))
+            self.sfx_select = loader.sound(os.path.join(MENU, "sound_select.wav"))
             self.sfx_select.set_volume(0.75)
         except:
             self.sfx_select = None
 
-        torch_frames = [
-            pygame.image.load(os.path.join(MENU, f"torch_{i:02}.png")).convert_alpha()
-            for i in range(1,5)
-        ]
-        self.torch_animation = TorchAnimationStrategy(torch_frames)
+        self.torch_animation = TorchAnimationStrategy(atlas.frames("menu/torch"))
+        self.torch_flipped = {id(f): pygame.transform.flip(f, True, False) for f in self.torch_animation.frames}
+
+        self.eye_surface = pygame.Surface((200,80), pygame.SRCALPHA)
+        pygame.draw.ellipse(self.eye_surface, (255,0,0,200), (10, 20, 35, 20))
+        pygame.draw.ellipse(self.eye_surface, (255,0,0,200), (120, 20, 35, 20))
 
         base_y = 420
         gap = 90
@@ -133,6 +149,10 @@ class MenuScreen:
         self.torch_animation.update(dt)
         self.fog_x = (self.fog_x + 20*dt) % self.fog.get_width()
 
+    def animating(self):
+        # Antorchas y niebla no paran: el planificador solo puede bajar el ritmo, no dormir
+        return True
+
     def draw(self, screen):
         screen.fill((10,10,14))
         screen.blit(self.bg, (0,0))
@@ -143,13 +163,10 @@ class MenuScreen:
         # 🔥 Strategy
         lf = self.torch_animation.get_frame()
         screen.blit(lf, (75, 135))
-        screen.blit(pygame.transform.flip(lf, True, False), (W-75-32, 135))
+        screen.blit(self.torch_flipped[id(lf)], (W-75-32, 135))
 
         # 👁️ Ojos del templo
-        eye_surface = pygame.Surface((200,80), pygame.SRCALPHA)
-        pygame.draw.ellipse(eye_surface, (255,0,0,200), (10, 20, 35, 20))
-        pygame.draw.ellipse(eye_surface, (255,0,0,200), (120, 20, 35, 20))
-        screen.blit(eye_surface, (W//2 - 100, 260))
+        screen.blit(self.eye_surface, (W//2 - 100, 260))
 
         # 🌫️ Niebla
         fx = int(self.fog_x)
@@ -159,7 +176,7 @@ class MenuScreen:
         for b in self.buttons:
             b.draw(screen)
 
-        hint = self.sub_font.render("Toque para seleccionar", True, (210,210,210))
+        hint = render_text("Toque para seleccionar", (210,210,210), *HINT_FONT)
         screen.blit(hint, (W//2 - hint.get_width()//2, 760))
 
     def handle(self, events):
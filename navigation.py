@@ -0,0 +1,223 @@
+import heapq, math
+from collections import OrderedDict
+from tilemap import TILE
+
+WALK, JUMP, DROP = 0, 1, 2
+
+SIM_DT = 1/60      # paso fijo con el que se comprueban los saltos al construir el grafo
+SIM_FRAMES = 240
+
+
+def nav_profile(w, h, speed, jump_speed=0, gravity=980):
+    # Hitbox en píxeles y físicas del agente: clave de Level.navigation()
+    return (w, h, speed, jump_speed, gravity)
+
+
+class NavGraph:
+    # Grafo de plataformas precalculado al cargar el nivel.
+    # Nodo = celda donde puede apoyar los pies el agente (columna izquierda, fila de los pies).
+    # Aristas: andar a la celda vecina, dejarse caer desde un borde y saltar. Cada salto se
+    # comprueba simulando las mismas físicas que el agente (despegue desde node_x del origen,
+    # en el aire hacia node_x del destino), así que solo quedan los que de verdad aterrizan.
+    # Las consultas se responden con un "campo de flujo" hacia cada meta, cacheado (LRU):
+    # con la meta en la misma celda, cada agente solo hace una búsqueda en un dict por frame.
+    def __init__(self, solid_rects, cols, rows, profile, cache_size=32):
+        self.cols, self.rows = cols, rows
+        self.w, self.h, self.speed, self.jump_speed, self.gravity = profile
+        self.ww, self.hh = math.ceil(self.w/TILE), math.ceil(self.h/TILE)
+        self.step = int(self.speed*SIM_DT)
+        if self.jump_speed > 0:
+            air = 2*self.jump_speed/self.gravity
+            self.jump = int(self.jump_speed**2/(2*self.gravity)//TILE) + 1
+            self.reach = int(self.step/SIM_DT*air//TILE) + 1
+        else:
+            self.jump = self.reach = 0
+        self.cache_size = cache_size
+        self.solid = [[False]*cols for _ in range(rows)]
+        for r in solid_rects:
+            x, y = r.x//TILE, r.y//TILE
+            if 0 <= y < rows and 0 <= x < cols:
+                self.solid[y][x] = True
+
+        self.nodes = [(x, y) for y in range(rows) for x in range(cols) if self.walkable(x, y)]
+        self.node_set = set(self.nodes)
+        self.edges = {n: [] for n in self.nodes}
+        self.reverse = {n: [] for n in self.nodes}
+        self.spans = self._spans()
+        self.span_of = {}
+        for y, x0, x1 in self.spans:
+            for x in range(x0, x1 + 1):
+                self.span_of[(x, y)] = (self.node_x((x0, y)), self.node_x((x1, y)))
+        self._build()
+        self._flows = OrderedDict()
+
+    # ---------- Construcción ----------
+
+    def free(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and not self.solid[y][x]
+
+    def fits(self, x, y):
+        return all(self.free(cx, cy)
+                   for cy in range(y - self.hh + 1, y + 1)
+                   for cx in range(x, x + self.ww))
+
+    def grounded(self, x, y):
+        if y + 1 >= self.rows: return False
+        return any(0 <= cx < self.cols and self.solid[y+1][cx] for cx in range(x, x + self.ww))
+
+    def walkable(self, x, y):
+        return self.fits(x, y) and self.grounded(x, y)
+
+    def node_x(self, node):
+        # Posición (rect.x) en la que el agente queda centrado sobre las columnas del nodo
+        return node[0]*TILE + (self.ww*TILE - self.w)//2
+
+    def _link(self, a, b, cost, kind):
+        self.edges[a].append((b, cost, kind))
+        self.reverse[b].append((a, cost, kind))
+
+    def _build(self):
+        nodes = self.node_set
+        for (x, y) in self.nodes:
+            for d in (-1, 1):
+                nx = x + d
+                if (nx, y) in nodes:
+                    self._link((x, y), (nx, y), 1.0, WALK)
+                elif self.fits(nx, y):
+                    # Borde: el agente anda hasta node_x del destino y desde ahí cae en vertical
+                    ny = y + 1
+                    while ny < self.rows and self.fits(nx, ny) and not self.grounded(nx, ny):
+                        ny += 1
+                    if (nx, ny) in nodes:
+                        self._link((x, y), (nx, ny), 1.0 + 0.5*(ny - y), DROP)
+
+            if not self.jump: continue
+            span = self.span_of[(x, y)]
+            for ty in range(y - self.jump, y + self.jump + 1):
+                for tx in range(x - self.reach, x + self.reach + 1):
+                    t = (tx, ty)
+                    if t not in nodes or self.span_of[t] == span and ty == y: continue
+                    if self.simulate((x, y), t) == t:
+                        self._link((x, y), t, 2.0 + abs(tx - x) + abs(y - ty), JUMP)
+
+    def _hits(self, px, py):
+        x0, x1 = px//TILE, (px + self.w - 1)//TILE
+        y0, y1 = py//TILE, (py + self.h - 1)//TILE
+        if x0 < 0 or x1 >= self.cols: return True
+        for cy in range(max(0, y0), min(self.rows - 1, y1) + 1):
+            row = self.solid[cy]
+            for cx in range(x0, x1 + 1):
+                if row[cx]: return True
+        return False
+
+    def simulate(self, start, target):
+        # Mismo orden que Enemy.update: gravedad, decisión, x con colisión, y con colisión.
+        # Devuelve el nodo donde aterriza el agente (o None si cae fuera o no llega a tomar tierra).
+        px, goal = self.node_x(start), self.node_x(target)
+        py = (start[1] + 1)*TILE - self.h
+        vy, on_ground, airborne = 0.0, True, False
+        for _ in range(SIM_FRAMES):
+            vy += self.gravity*SIM_DT
+            if not airborne: vy = -self.jump_speed
+            dx = max(-self.step, min(self.step, goal - px))
+            if dx and not self._hits(px + dx, py): px += dx
+            dy = int(vy*SIM_DT)
+            on_ground = False
+            if self._hits(px, py + dy):
+                vy = 0
+                on_ground = dy > 0
+            else:
+                py += dy
+            if dy == 0: on_ground = self._hits(px, py + 1)
+            airborne = airborne or not on_ground
+            if airborne and on_ground:
+                # Al aterrizar el agente vuelve a decidir desde node_at: ese es el resultado
+                return self._node_near(px, py + self.h)
+            if py > self.rows*TILE: return None
+        return None
+
+    def _spans(self):
+        spans = []
+        for (x, y) in self.nodes:
+            if spans and spans[-1][0] == y and spans[-1][2] == x - 1:
+                spans[-1][2] = x
+            else:
+                spans.append([y, x, x])
+        return [tuple(s) for s in spans]
+
+    # ---------- Consultas ----------
+
+    def node_at(self, rect):
+        # Nodo del agente apoyado: el de node_x más cercano en su fila de pies.
+        # None si ese hueco no es un nodo (p.ej. sobre el borde de un vacío): no se corrige a un vecino
+        return self._node_near(rect.x, rect.bottom)
+
+    def _node_near(self, px, bottom):
+        n = (round((px - (self.ww*TILE - self.w)//2)/TILE), (bottom - 1)//TILE)
+        return n if n in self.node_set else None
+
+    def goal_at(self, rect):
+        # Nodo bajo el objetivo (que puede estar saltando): primero el de debajo, luego a los lados
+        x = min(max(0, (rect.centerx - self.ww*TILE//2 + TILE//2)//TILE), self.cols - 1)
+        y = (rect.bottom - 1)//TILE
+        for dy in range(0, 6):
+            for dx in (0, -1, 1):
+                n = (x + dx, y + dy)
+                if n in self.node_set: return n
+        return None
+
+    def flow(self, goal):
+        # Dijkstra inverso desde la meta: siguiente salto para cada nodo
+        f = self._flows.get(goal)
+        if f is not None:
+            self._flows.move_to_end(goal)
+            return f
+        dist = {goal: 0.0}
+        nxt = {}
+        heap = [(0.0, goal)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]: continue
+            for u, cost, kind in self.reverse[v]:
+                nd = d + cost
+                if nd < dist.get(u, math.inf):
+                    dist[u] = nd
+                    nxt[u] = (v, kind)
+                    heapq.heappush(heap, (nd, u))
+        self._flows[goal] = nxt
+        if len(self._flows) > self.cache_size:
+            self._flows.popitem(last=False)
+        return nxt
+
+    def next_step(self, start, goal):
+        if start is None or goal is None or start == goal: return None
+        if goal not in self.node_set: return None
+        return self.flow(goal).get(start)
+
+    def path(self, start, goal, limit=512):
+        if start is None or goal not in self.node_set: return []
+        if start == goal: return [start]
+        nxt = self.flow(goal)
+        if start not in nxt: return []
+        out = [start]
+        while out[-1] != goal and len(out) < limit:
+            out.append(nxt[out[-1]][0])
+        return out
+
+    def steer(self, rect, target_rect):
+        # -> (rect.x al que ir, saltar ya?) para acercarse al objetivo por el grafo;
+        # None si no hay ruta (agente sobre un hueco, objetivo fuera del grafo o inalcanzable)
+        start, goal = self.node_at(rect), self.goal_at(target_rect)
+        if start is None or goal is None: return None
+        if start == goal:
+            lo, hi = self.span_of[start]
+            return min(hi, max(lo, target_rect.centerx - self.w//2)), False
+        step = self.next_step(start, goal)
+        if step is None: return None
+        nxt, kind = step
+        if kind == JUMP:
+            # Primero colocarse en el punto de despegue que se simuló al construir el grafo
+            x0 = self.node_x(start)
+            if rect.x != x0: return x0, False
+            return self.node_x(nxt), True
+        return self.node_x(nxt), False
@@ -0,0 +1,166 @@
+import math, random
+from array import array
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FADE_STEPS = 4
+SIZE = 3
+
+
+class ParticlePool:
+    # Capacidad fija en arrays paralelos. Las partículas vivas ocupan [0, n):
+    # al morir una se copia la última en su hueco, así emitir no reserva memoria.
+    # Con numpy se actualiza vectorizado sobre los mismos buffers; sin él, bucle simple.
+    FIELDS = ("x", "y", "vx", "vy", "life", "max_life", "color")
+
+    def __init__(self, capacity=4096, gravity=420.0):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.n = 0
+        for name in self.FIELDS[:-1]:
+            setattr(self, name, array("f", [0.0]) * capacity)
+        self.color = array("H", [0]) * capacity
+        self.palette = []
+        self.sprites = []
+        self._views = {name: np.frombuffer(getattr(self, name), dtype=np.float32 if name != "color" else np.uint16)
+                       for name in self.FIELDS} if np is not None else None
+
+    def color_index(self, rgb):
+        rgb = tuple(rgb[:3])
+        if rgb in self.palette:
+            return self.palette.index(rgb)
+        self.palette.append(rgb)
+        steps = []
+        for i in range(FADE_STEPS):
+            s = pygame.Surface((SIZE, SIZE), pygame.SRCALPHA)
+            s.fill((*rgb, 255 - i * (255 // FADE_STEPS)))
+            steps.append(s)
+        self.sprites.append(steps)
+        return len(self.palette) - 1
+
+    def clear(self):
+        self.n = 0
+
+    def emit(self, x, y, vx, vy, life, color):
+        i = self.n
+        if i >= self.capacity: return False
+        self.x[i] = x; self.y[i] = y
+        self.vx[i] = vx; self.vy[i] = vy
+        self.life[i] = life; self.max_life[i] = life
+        self.color[i] = color
+        self.n = i + 1
+        return True
+
+    def update(self, dt):
+        if self.n == 0: return
+        if self._views is not None:
+            self._update_np(dt)
+        else:
+            self._update_py(dt)
+
+    def _update_np(self, dt):
+        n = self.n
+        v = self._views
+        life = v["life"][:n]
+        life -= dt
+        v["vy"][:n] += self.gravity * dt
+        v["x"][:n] += v["vx"][:n] * dt
+        v["y"][:n] += v["vy"][:n] * dt
+        alive = life > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            for name in self.FIELDS:
+                col = v[name]
+                col[:k] = col[:n][alive]
+            self.n = k
+
+    def _update_py(self, dt):
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        g = self.gravity * dt
+        n = self.n
+        i = 0
+        while i < n:
+            life[i] -= dt
+            if life[i] <= 0:
+                n -= 1
+                for name in self.FIELDS:
+                    col = getattr(self, name)
+                    col[i] = col[n]
+                continue
+            vy[i] += g
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            i += 1
+        self.n = n
+
+    def draw(self, surf, camx, camy):
+        n = self.n
+        if n == 0: return
+        sw, sh = surf.get_size()
+        sprites = self.sprites
+        if self._views is not None:
+            v = self._views
+            px = (v["x"][:n] - camx).astype(np.int32)
+            py = (v["y"][:n] - camy).astype(np.int32)
+            fade = ((1.0 - v["life"][:n] / v["max_life"][:n]) * FADE_STEPS).astype(np.int32).clip(0, FADE_STEPS - 1)
+            vis = (px > -SIZE) & (px < sw) & (py > -SIZE) & (py < sh)
+            seq = [(sprites[c][f], (xx, yy)) for xx, yy, c, f in zip(
+                px[vis].tolist(), py[vis].tolist(), v["color"][:n][vis].tolist(), fade[vis].tolist())]
+        else:
+            x, y, life, max_life, color = self.x, self.y, self.life, self.max_life, self.color
+            seq = []
+            for i in range(n):
+                xx = int(x[i] - camx); yy = int(y[i] - camy)
+                if xx <= -SIZE or xx >= sw or yy <= -SIZE or yy >= sh: continue
+                f = min(FADE_STEPS - 1, int((1.0 - life[i] / max_life[i]) * FADE_STEPS))
+                seq.append((sprites[color[i]][f], (xx, yy)))
+        surf.blits(seq, False)
+
+
+class Emitter:
+    # Se engancha a cualquier objeto con .rect (jugador, jefe, plataforma...).
+    def __init__(self, pool, color, target=None, anchor="center", rate=0.0,
+                 speed=(40, 120), angle=(0, 360), life=(0.3, 0.8)):
+        self.pool = pool
+        self.color = pool.color_index(color)
+        self.target = target
+        self.anchor = anchor
+        self.rate = rate
+        self.speed = speed
+        self.angle = angle
+        self.life = life
+        self.active = False
+        self._acc = 0.0
+
+    def origin(self):
+        return getattr(self.target.rect, self.anchor)
+
+    def emit_at(self, pos, count):
+        x, y = pos
+        a0, a1 = self.angle
+        s0, s1 = self.speed
+        l0, l1 = self.life
+        emit = self.pool.emit
+        for _ in range(count):
+            a = math.radians(random.uniform(a0, a1))
+            s = random.uniform(s0, s1)
+            if not emit(x, y, math.cos(a) * s, math.sin(a) * s, random.uniform(l0, l1), self.color):
+                break
+
+    def burst(self, count):
+        if self.target is not None:
+            self.emit_at(self.origin(), count)
+
+    def update(self, dt):
+        if not self.active or self.rate <= 0 or self.target is None:
+            self._acc = 0.0
+            return
+        self._acc += self.rate * dt
+        count = int(self._acc)
+        if count:
+            self._acc -= count
+            self.emit_at(self.origin(), count)
@@ -0,0 +1,212 @@
+import os, math, weakref
+import pygame
+
+W, H = 480, 800
+
+NONE  = 0  # SDL_BLENDMODE_NONE
+BLEND = 1  # SDL_BLENDMODE_BLEND
+ADD   = 2  # SDL_BLENDMODE_ADD
+MOD   = 4  # SDL_BLENDMODE_MOD
+
+# special_flags de Surface.blit -> modo de mezcla de la textura
+BLEND_MODES = {
+    0: BLEND,
+    pygame.BLEND_RGB_ADD: ADD,
+    pygame.BLEND_RGB_MULT: MOD,
+}
+
+
+class SurfaceBackend:
+    # Ruta clásica: blits por software sobre la superficie de set_mode.
+    # Si la ventana no mide W x H se dibuja a resolución lógica y se escala al presentar.
+    def __init__(self, window_size=(W, H), caption=""):
+        self.window_size = tuple(window_size)
+        self.display = pygame.display.set_mode(self.window_size)
+        pygame.display.set_caption(caption)
+        if self.window_size == (W, H):
+            self.canvas = self.display
+        else:
+            self.canvas = pygame.Surface((W, H)).convert()
+        self.view = _fit((W, H), self.window_size)
+
+    def present(self):
+        if self.canvas is not self.display:
+            self.display.fill((0, 0, 0))
+            pygame.transform.scale(self.canvas, self.view.size, self.display.subsurface(self.view))
+        pygame.display.flip()
+
+    def to_logical(self, pos):
+        return _unfit(pos, self.view, (W, H))
+
+
+class RendererCanvas:
+    # Imita la parte de pygame.Surface que usa el juego (blit/fill/get_size)
+    # pero dibuja con texturas del Renderer. Las texturas se suben una vez por superficie:
+    # las subsuperficies (tiles, frames del atlas) comparten la textura de su padre.
+    def __init__(self, renderer, scale):
+        self.renderer = renderer
+        self.scale = scale
+        self.textures = weakref.WeakKeyDictionary()
+
+    def get_size(self): return (W, H)
+    def get_width(self): return W
+    def get_height(self): return H
+
+    def texture(self, surf):
+        tex = self.textures.get(surf)
+        if tex is None:
+            from pygame._sdl2.video import Texture
+            tex = Texture.from_surface(self.renderer, surf)
+            self.textures[surf] = tex
+        return tex
+
+    def blit(self, surf, dest, area=None, special_flags=0):
+        parent = surf.get_abs_parent()
+        ox, oy = surf.get_abs_offset()
+        w, h = surf.get_size()
+        if area is not None:
+            area = pygame.Rect(area)
+            ox += area.x; oy += area.y; w, h = area.size
+        tex = self.texture(parent)
+        a = surf.get_alpha()
+        if not special_flags and a is None and parent.get_colorkey() is None \
+                and not parent.get_flags() & pygame.SRCALPHA:
+            # Superficie opaca: copia directa, sin mezcla (mucho más barato en el renderer por software)
+            tex.blend_mode = NONE
+        else:
+            tex.blend_mode = BLEND_MODES.get(special_flags, BLEND)
+        tex.alpha = 255 if a is None else a
+        x, y = (dest[0], dest[1])
+        s = self.scale
+        tex.draw(
+            srcrect=(ox, oy, w, h),
+            dstrect=(math.floor(x*s), math.floor(y*s), math.ceil(w*s), math.ceil(h*s)),
+        )
+
+    def blits(self, seq, doreturn=True):
+        for surf, dest in seq:
+            self.blit(surf, dest)
+
+    def layer(self):
+        return RendererLayer(self)
+
+    def blit_layer(self, layer, special_flags=0):
+        tex = layer.texture
+        tex.blend_mode = BLEND_MODES.get(special_flags, BLEND)
+        s = self.scale
+        tex.draw(dstrect=(0, 0, math.ceil(W*s), math.ceil(H*s)))
+
+    def fill(self, color, rect=None):
+        r = self.renderer
+        r.draw_color = tuple(color) if len(color) == 4 else (*color, 255)
+        if rect is None:
+            r.clear()
+        else:
+            rect = pygame.Rect(rect)
+            s = self.scale
+            r.fill_rect((math.floor(rect.x*s), math.floor(rect.y*s), math.ceil(rect.w*s), math.ceil(rect.h*s)))
+
+
+class RendererLayer:
+    # Textura de destino a resolución lógica con la misma API de dibujo que el lienzo.
+    # Dentro de "with layer as lienzo:" todo se dibuja en ella sin pasar por la CPU;
+    # comparte las texturas ya subidas con el lienzo principal.
+    def __init__(self, canvas):
+        from pygame._sdl2.video import Texture
+        self.renderer = canvas.renderer
+        self.texture = Texture(self.renderer, (W, H), target=True)
+        self.canvas = RendererCanvas(self.renderer, 1.0)
+        self.canvas.textures = canvas.textures
+
+    def __enter__(self):
+        r = self.renderer
+        self._target, self._viewport = r.target, r.get_viewport()
+        r.target = self.texture
+        return self.canvas
+
+    def __exit__(self, *exc):
+        r = self.renderer
+        r.target = self._target
+        r.set_viewport(self._viewport)
+
+
+class RendererBackend:
+    # pygame._sdl2.video: texturas en GPU cuando hay aceleración; con accelerated=0
+    # usa el renderer por software de SDL (sirve para probar sin GPU).
+    # internal_scale < 1 dibuja en una textura más pequeña y la escala a la ventana.
+    def __init__(self, window_size=(W, H), caption="", accelerated=-1, internal_scale=1.0, vsync=False):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        self.window_size = tuple(window_size)
+        self.window = Window(caption, size=self.window_size)
+        self.renderer = Renderer(self.window, accelerated=accelerated, vsync=vsync, target_texture=True)
+        self.view = _fit((W, H), self.window_size)
+
+        if internal_scale < 1.0:
+            iw, ih = max(1, int(W*internal_scale)), max(1, int(H*internal_scale))
+            self.target = Texture(self.renderer, (iw, ih), target=True)
+            self.canvas = RendererCanvas(self.renderer, iw / W)
+        else:
+            self.target = None
+            self.canvas = RendererCanvas(self.renderer, self.view.w / W)
+        self._begin()
+
+    def _begin(self):
+        r = self.renderer
+        if self.target is not None:
+            r.target = self.target
+        else:
+            r.target = None
+            # Sin textura intermedia: desplazamiento del letterbox vía viewport
+            r.set_viewport(self.view)
+
+    def present(self):
+        r = self.renderer
+        if self.target is not None:
+            r.target = None
+            r.draw_color = (0, 0, 0, 255)
+            r.clear()
+            self.target.draw(dstrect=self.view)
+        r.present()
+        self._begin()
+
+    def to_logical(self, pos):
+        return _unfit(pos, self.view, (W, H))
+
+
+def _fit(logical, window):
+    lw, lh = logical
+    ww, wh = window
+    s = min(ww / lw, wh / lh)
+    vw, vh = int(lw*s), int(lh*s)
+    return pygame.Rect((ww - vw)//2, (wh - vh)//2, vw, vh)
+
+
+def _unfit(pos, view, logical):
+    x = (pos[0] - view.x) * logical[0] / view.w
+    y = (pos[1] - view.y) * logical[1] / view.h
+    return (int(x), int(y))
+
+
+_backend = None
+
+def create_backend(caption=""):
+    # TEMPLO_RENDERER: surface (por defecto) | sdl2 | sdl2-software
+    # TEMPLO_WINDOW: tamaño de ventana "AnchoxAlto"; TEMPLO_INTERNAL_SCALE: p.ej. 0.5
+    global _backend
+    kind = os.environ.get("TEMPLO_RENDERER", "surface")
+    size = os.environ.get("TEMPLO_WINDOW")
+    window = tuple(int(v) for v in size.lower().split("x")) if size else (W, H)
+    scale = float(os.environ.get("TEMPLO_INTERNAL_SCALE", "1"))
+
+    if kind == "sdl2":
+        _backend = RendererBackend(window, caption, accelerated=-1, internal_scale=scale)
+    elif kind == "sdl2-software":
+        _backend = RendererBackend(window, caption, accelerated=0, internal_scale=scale)
+    else:
+        _backend = SurfaceBackend(window, caption)
+    return _backend
+
+
+def mouse_pos():
+    pos = pygame.mouse.get_pos()
+    return _backend.to_logical(pos) if _backend else pos
@@ -0,0 +1,66 @@
+import os, hashlib
+import pygame
+from asset_loader import loader
+from tilemap import TILE_INDEX, load_csv, slice_tiles
+
+ASSETS = "assets"
+THUMBS = os.path.join(ASSETS, "cache", "thumbs")
+
+THUMB_SIZE = (96, 64)
+THUMB_VERSION = b"2"
+BACKGROUND = (14, 12, 18)
+
+
+def content_key(csv_path, tiles_path, size=THUMB_SIZE):
+    h = hashlib.sha1(THUMB_VERSION)
+    h.update(repr(size).encode())
+    for p in (csv_path, tiles_path):
+        with open(p, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def render_minimap(grid, tiles, size=THUMB_SIZE):
+    # Color medio de cada tile, ajustado al tamaño de la miniatura y centrado
+    colors = {tid: pygame.transform.average_color(tiles[i])[:3]
+              for tid, i in TILE_INDEX.items() if i < len(tiles)}
+    gh = len(grid)
+    gw = max((len(row) for row in grid), default=0)
+    thumb = pygame.Surface(size)
+    thumb.fill(BACKGROUND)
+    if not gw or not gh: return thumb
+
+    # Un píxel por tile y luego escalado al hueco disponible
+    mini = pygame.Surface((gw, gh))
+    mini.fill(BACKGROUND)
+    for y, row in enumerate(grid):
+        for x, tid in enumerate(row):
+            c = colors.get(tid)
+            if c is not None:
+                mini.set_at((x, y), c)
+    s = min(size[0] / gw, size[1] / gh)
+    fit = (max(1, int(gw*s)), max(1, int(gh*s)))
+    thumb.blit(pygame.transform.scale(mini, fit), ((size[0] - fit[0])//2, (size[1] - fit[1])//2))
+    return thumb
+
+
+def get_thumbnail(csv_path, tiles_path, size=THUMB_SIZE, cache_dir=THUMBS):
+    # Caché en disco por hash del contenido del mapa y del tileset:
+    # si nada ha cambiado solo se decodifica un PNG diminuto.
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    key = content_key(csv_path, tiles_path, size)
+    path = os.path.join(cache_dir, f"{name}-{key}.png")
+    if os.path.exists(path):
+        return loader.image(path, alpha=False)
+
+    tiles = slice_tiles(pygame.image.load(tiles_path))
+    thumb = render_minimap(load_csv(csv_path), tiles, size)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for old in os.listdir(cache_dir):
+            if old.startswith(name + "-"):
+                os.remove(os.path.join(cache_dir, old))
+        pygame.image.save(thumb, path)
+    except OSError as err:
+        print(f"Advertencia: no se pudo guardar la miniatura {path}: {err}")
+    return thumb
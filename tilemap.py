@@ -0,0 +1,30 @@
+import csv
+
+TILE = 32
+CHUNK_ROWS = 8   # filas de tiles por trozo de nivel pre-renderizado (Level.chunk y Lighting)
+
+# id del CSV -> índice del tile dentro del tileset
+TILE_INDEX = {
+    1:0, 2:1, 3:2, 4:3, 5:4, 6:5, 7:7, 8:8, 9:9,  # Tiles originales
+    10: 4,  # Pinchos (usando el mismo sprite que el original 5/4, quizás necesites uno nuevo)
+    11: 10, # Roca de Fondo
+    12: 11, # Caja de Madera
+    13: 12, # Antorcha
+    14: 3,  # Borde Superior (usando el mismo sprite que 4, por ejemplo)
+    15: 13, # Agua
+    16: 14, # Cadena Colgante
+    17: 15, # Liana/Escalera
+    18: 0,  # Bloque Invisible (mapeado a aire/transparente para que no se vea)
+}
+
+
+def load_csv(path):
+    with open(path) as f:
+        return [list(map(int, r)) for r in csv.reader(f)]
+
+def slice_tiles(img):
+    tw, th = img.get_size()
+    return [
+        img.subsurface((x*TILE, y*TILE, TILE, TILE))
+        for y in range(th//TILE) for x in range(tw//TILE)
+    ]